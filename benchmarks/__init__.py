@@ -0,0 +1,3 @@
+"""
+Benchmarks hors ligne pour Trading Agent Simple.
+"""
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmarks hors ligne: récupération des données, calcul des signaux,
+écriture Google Sheets et analyse rapide complète, sur des portefeuilles
+synthétiques de 10 à 10 000 symboles.
+
+    python -m benchmarks.run_benchmarks --sizes 10 100 1000 --days 60
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SyntheticMarketData, FakeSheetsService
+from src.backtest import backtest_portfolios, run_backtest
+from src.calculate_signals import calculate_signals, calculate_signals_panel, build_price_panel
+from src.param_sweep import run_sweep
+from src.quick_analyze import analyze_quick
+from stocks.price_store import PriceStore
+from google_integration.batch_writer import GoogleBatchWriter
+from google_integration.data_handler import GoogleDataHandler
+from google_integration.sheets_manager import GoogleSheetsManager
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+
+@contextlib.contextmanager
+def _quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _record(results, stage, size, seconds, rows, api_calls=None, bytes_per_symbol_year=None):
+    results.append({
+        'stage': stage,
+        'symbols': size,
+        'seconds': seconds,
+        'symbols_per_s': size / seconds if seconds else float('inf'),
+        'rows_per_s': rows / seconds if seconds else float('inf'),
+        'api_calls': api_calls,
+        'bytes_per_symbol_year': bytes_per_symbol_year
+    })
+
+
+def _frames_nbytes(frames):
+    return sum(data.memory_usage(index=True, deep=True).sum() for _, data in frames if data is not None)
+
+
+def _analysis_rows(frames):
+    rows = []
+    for symbol, data in frames:
+        analysis = calculate_signals(data)
+        if analysis:
+            rows.append((symbol, {
+                'company': symbol,
+                'price': f"{analysis['price']:.2f}",
+                'rsi': 'N/A',
+                'macd': 'N/A',
+                'signal': ', '.join(analysis['signals']),
+                'recommendation': analysis['decision'],
+                'volume': f"{data['Volume'].iloc[-1]:.0f}",
+                'change_percent': "0.00%"
+            }))
+    return rows
+
+
+def run(sizes=DEFAULT_SIZES, days=60, seed=42, latency=0.0, direct_sheets_limit=1000):
+    provider = SyntheticMarketData(seed=seed)
+    results = []
+
+    for size in sizes:
+        portfolio = SyntheticMarketData.make_portfolio(size)
+
+        seconds, frames = _timed(lambda: provider.fetch_portfolio_data(portfolio, days))
+        _record(results, 'fetch (synthétique)', size, seconds, size * days)
+
+        seconds, _ = _timed(lambda: [calculate_signals(data.copy()) for _, data in frames])
+        _record(results, 'calculate_signals (boucle)', size, seconds, size * days)
+
+        seconds, _ = _timed(lambda: calculate_signals_panel(build_price_panel(dict(frames))))
+        _record(results, 'calculate_signals_panel', size, seconds, size * days,
+                bytes_per_symbol_year=_frames_nbytes(frames) * 252 / (size * days))
+
+        seconds, store = _timed(lambda: PriceStore.from_frames(dict(frames)))
+        _record(results, 'PriceStore (construction)', size, seconds, size * days)
+
+        seconds, _ = _timed(lambda: calculate_signals_panel(store.close_panel()))
+        _record(results, 'calculate_signals_panel (store)', size, seconds, size * days,
+                bytes_per_symbol_year=store.nbytes * 252 / (size * len(store.dates)))
+
+        rows = _analysis_rows(frames)
+
+        if size <= direct_sheets_limit:
+            service = FakeSheetsService(latency=latency)
+            handler = GoogleDataHandler(service, 'benchmark')
+            with _quiet():
+                seconds, _ = _timed(lambda: [
+                    handler.append_analysis(symbol, data) for symbol, data in rows
+                ])
+            _record(results, 'sheets append (ligne à ligne)', size, seconds, len(rows), sum(service.calls.values()))
+
+        service = FakeSheetsService(latency=latency)
+        handler = GoogleDataHandler(service, 'benchmark')
+
+        def batched_write():
+            writer = GoogleBatchWriter(handler, max_rows=500, flush_interval=None)
+            for symbol, data in rows:
+                writer.add(symbol, handler._prepare_analysis_row(symbol, data, "Quick"))
+            return writer.close()
+        with _quiet():
+            seconds, _ = _timed(batched_write)
+        _record(results, 'sheets append (groupé)', size, seconds, len(rows), sum(service.calls.values()))
+
+        service = FakeSheetsService(latency=latency)
+        with _quiet():
+            # Miroir en mémoire: ne pas toucher à l'historique local de l'utilisateur
+            manager = GoogleSheetsManager(service=service, history_db=':memory:')
+            manager.set_spreadsheet('benchmark')
+            seconds, _ = _timed(lambda: analyze_quick(
+                'BENCH', portfolio, manager, provider=provider
+            ))
+        _record(results, 'analyze_quick (complet)', size, seconds, size * days, sum(service.calls.values()))
+
+    return results
+
+
+def check_mixed_calendars(days=500, seed=42, holiday_every=40):
+    """
+    Vérifie qu'un symbole US (index New York, un jour férié toutes les
+    holiday_every barres) donne le même backtest seul et aux côtés d'un
+    symbole parisien (index Paris), et que la recherche en grille retrouve
+    le backtest du portefeuille pour MA20/MA50. Retourne True si tout concorde.
+    """
+    provider = SyntheticMarketData(seed)
+    us = provider.get_stock_data('SYNUS', days)
+    us = us.drop(us.index[::holiday_every])
+    us.index = us.index.tz_localize('America/New_York')
+    paris = provider.get_stock_data('SYN.PA', days)
+    paris.index = paris.index.tz_localize('Europe/Paris')
+    panel = build_price_panel({'SYNUS': us, 'SYN.PA': paris})
+
+    alone = run_backtest(build_price_panel({'SYNUS': us}))['stats'].loc['SYNUS']
+    mixed = run_backtest(panel)['stats'].loc['SYNUS']
+
+    columns = ['total_return', 'cagr', 'volatility', 'sharpe', 'max_drawdown', 'turnover']
+    portfolio = backtest_portfolios({'MIXTE': {'SYNUS': '', 'SYN.PA': ''}}, panel)['portfolios'].loc['MIXTE', columns]
+    sweep = run_sweep(panel, [(20, 50)], processes=1).loc[0, columns]
+
+    def same(a, b):
+        return bool(np.allclose(a.to_numpy(dtype='float64'), b.to_numpy(dtype='float64'), equal_nan=True))
+    return same(alone, mixed) and same(portfolio, sweep)
+
+
+def print_report(results):
+    print(f"{'Étape':<32} | {'Symboles':>8} | {'Temps (s)':>10} | {'Symboles/s':>12} | {'Lignes/s':>12} | "
+          f"{'Appels API':>10} | {'Octets/sym-an':>13}")
+    print("-" * 116)
+    for r in results:
+        calls = '' if r['api_calls'] is None else r['api_calls']
+        memory = '' if r.get('bytes_per_symbol_year') is None else f"{r['bytes_per_symbol_year']:,.0f}"
+        print(f"{r['stage']:<32} | {r['symbols']:>8} | {r['seconds']:>10.4f} | "
+              f"{r['symbols_per_s']:>12,.0f} | {r['rows_per_s']:>12,.0f} | {calls:>10} | {memory:>13}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne de Trading Agent Simple")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Tailles de portefeuille")
+    parser.add_argument('--days', type=int, default=60, help="Nombre de jours par symbole")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des données synthétiques")
+    parser.add_argument('--latency', type=float, default=0.0, help="Latence simulée par appel Google (s)")
+    parser.add_argument('--json', dest='json_path', help="Fichier de sortie JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.days, args.seed, args.latency)
+    print_report(results)
+
+    aligned = check_mixed_calendars(seed=args.seed)
+    print(f"\n{'✅' if aligned else '❌'} Backtest et recherche en grille multi-places: "
+          f"{'cohérents' if aligned else 'écart détecté'}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Résultats enregistrés dans {args.json_path}")
+    return 0 if aligned else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Données de marché synthétiques et stand-in en mémoire du service Google Sheets.
+"""
+
+import re
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from stocks.providers import DataProvider
+
+
+class SyntheticMarketData(DataProvider):
+    """
+    Fournisseur de données déterministe: chaque symbole reçoit une marche
+    aléatoire OHLCV reproductible (graine dérivée du symbole).
+    """
+
+    name = 'synthetic'
+
+    def __init__(self, seed=42, start_price=100.0, volatility=0.02, end_date=None):
+        self.seed = seed
+        self.start_price = start_price
+        self.volatility = volatility
+        self.end_date = pd.Timestamp(end_date or datetime.now().date())
+
+    @staticmethod
+    def make_portfolio(size, prefix="SYN"):
+        return {f"{prefix}{i:05d}": f"Synthetic {i}" for i in range(size)}
+
+    def get_stock_data(self, symbol, days=60, timeout=None):
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+        index = pd.bdate_range(end=self.end_date, periods=days, name='Date')
+
+        returns = rng.normal(0.0003, self.volatility, days)
+        close = self.start_price * np.exp(np.cumsum(returns))
+        open_ = close * (1 + rng.normal(0, self.volatility / 4, days))
+        spread = np.abs(rng.normal(0, self.volatility / 2, days)) * close
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread
+        volume = rng.integers(100_000, 10_000_000, days)
+
+        return pd.DataFrame({
+            'Open': open_,
+            'High': high,
+            'Low': low,
+            'Close': close,
+            'Volume': volume,
+            'Dividends': 0.0,
+            'Stock Splits': 0.0
+        }, index=index)
+
+    def fetch_portfolio_data(self, portfolio, days=60, max_workers=None, timeout=None):
+        # Génération en mémoire: un pool de threads n'apporterait rien
+        return [(symbol, self.get_stock_data(symbol, days)) for symbol in portfolio]
+
+
+class _Request:
+
+    def __init__(self, service, name, action):
+        self._service = service
+        self._name = name
+        self._action = action
+
+    def execute(self):
+        self._service.calls[self._name] += 1
+        if self._service.latency:
+            time.sleep(self._service.latency)
+        return self._action()
+
+
+class _Values:
+
+    _RANGE = re.compile(r"^(?P<sheet>[^!]+)!(?P<start_col>[A-Z]+)(?P<start_row>\d*)(?::(?P<end_col>[A-Z]+)(?P<end_row>\d*))?$")
+
+    def __init__(self, service):
+        self._service = service
+
+    def _parse(self, range_name):
+        match = self._RANGE.match(range_name)
+        if not match:
+            raise ValueError(f"Plage non supportée: {range_name}")
+        start = int(match['start_row']) - 1 if match['start_row'] else 0
+        end = int(match['end_row']) if match['end_row'] else None
+        return match['sheet'], start, end
+
+    def append(self, spreadsheetId, range, valueInputOption, body):
+        sheet, _, _ = self._parse(range)
+
+        def action():
+            rows = self._service.sheet_rows(sheet)
+            rows.extend(list(row) for row in body['values'])
+            return {'updates': {'updatedRows': len(body['values'])}}
+        return _Request(self._service, 'values.append', action)
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        sheet, start, _ = self._parse(range)
+
+        def action():
+            rows = self._service.sheet_rows(sheet)
+            for offset, row in enumerate(body['values']):
+                while len(rows) <= start + offset:
+                    rows.append([])
+                rows[start + offset] = list(row)
+            return {'updatedRows': len(body['values'])}
+        return _Request(self._service, 'values.update', action)
+
+    def get(self, spreadsheetId, range, **kwargs):
+        sheet, start, end = self._parse(range)
+
+        def action():
+            rows = self._service.sheet_rows(sheet)[start:end]
+            return {'values': [list(row) for row in rows]} if rows else {}
+        return _Request(self._service, 'values.get', action)
+
+
+class _Spreadsheets:
+
+    def __init__(self, service):
+        self._service = service
+
+    def values(self):
+        return _Values(self._service)
+
+    def get(self, spreadsheetId, **kwargs):
+        def action():
+            return {
+                'properties': {'title': 'Benchmark'},
+                'sheets': [
+                    {'properties': {'title': title, 'sheetId': self._service.sheet_ids[title]}}
+                    for title in self._service.sheets
+                ],
+                'developerMetadata': [dict(entry) for entry in self._service.developer_metadata]
+            }
+        return _Request(self._service, 'spreadsheets.get', action)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def action():
+            titles = {gid: title for title, gid in self._service.sheet_ids.items()}
+            for request in body.get('requests', []):
+                if 'addSheet' in request:
+                    properties = request['addSheet']['properties']
+                    title = properties['title']
+                    if title in self._service.sheets:
+                        raise Exception(f"A sheet with the name \"{title}\" already exists")
+                    self._service.sheets[title] = []
+                    self._service.sheet_ids[title] = properties.get('sheetId', len(self._service.sheet_ids))
+                    titles[self._service.sheet_ids[title]] = title
+                elif 'deleteDimension' in request:
+                    rng = request['deleteDimension']['range']
+                    rows = self._service.sheets[titles[rng['sheetId']]]
+                    del rows[rng['startIndex']:rng['endIndex']]
+                elif 'updateCells' in request:
+                    update = request['updateCells']
+                    rows = self._service.sheets[titles[update['start']['sheetId']]]
+                    header = [cell['userEnteredValue']['stringValue'] for cell in update['rows'][0]['values']]
+                    if rows:
+                        rows[0] = header
+                    else:
+                        rows.append(header)
+                elif 'createDeveloperMetadata' in request:
+                    entry = dict(request['createDeveloperMetadata']['developerMetadata'])
+                    entry['metadataId'] = len(self._service.developer_metadata) + 1
+                    self._service.developer_metadata.append(entry)
+                elif 'updateDeveloperMetadata' in request:
+                    update = request['updateDeveloperMetadata']
+                    metadata_id = update['dataFilters'][0]['developerMetadataLookup']['metadataId']
+                    for entry in self._service.developer_metadata:
+                        if entry['metadataId'] == metadata_id:
+                            entry['metadataValue'] = update['developerMetadata']['metadataValue']
+            return {'replies': [{} for _ in body.get('requests', [])]}
+        return _Request(self._service, 'spreadsheets.batchUpdate', action)
+
+
+class FakeSheetsService:
+    """
+    Stand-in en mémoire de l'objet `service` Google Sheets (API v4), limité
+    aux appels utilisés par google_integration. Les appels sont comptés et
+    peuvent simuler une latence réseau.
+    """
+
+    def __init__(self, latency=0.0, sheet_names=("Trading_Analysis",)):
+        self.latency = latency
+        self.sheets = {name: [] for name in sheet_names}
+        self.sheet_ids = {name: gid for gid, name in enumerate(sheet_names)}
+        self.developer_metadata = []
+        self.calls = Counter()
+
+    def sheet_rows(self, name):
+        if name not in self.sheets:
+            self.sheet_ids[name] = len(self.sheet_ids)
+        return self.sheets.setdefault(name, [])
+
+    def spreadsheets(self):
+        return _Spreadsheets(self)
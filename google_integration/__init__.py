@@ -4,8 +4,9 @@ Gestion de l'intégration Google Sheets.
 """
 
 from .auth import GoogleAuth
+from .service_pool import GoogleServicePool, get_service_pool
 from .sheets_manager import GoogleSheetsManager
 from .data_handler import GoogleDataHandler
 from .formatter import GoogleSheetsFormatter
 
-__all__ = ['GoogleAuth', 'GoogleSheetsManager', 'GoogleDataHandler', 'GoogleSheetsFormatter']
+__all__ = ['GoogleAuth', 'GoogleServicePool', 'get_service_pool', 'GoogleSheetsManager', 'GoogleDataHandler', 'GoogleSheetsFormatter']
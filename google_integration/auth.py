@@ -2,32 +2,37 @@
 Gestion de l'authentification Google Sheets.
 """
 
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+from .service_pool import get_service_pool
 
 
 class GoogleAuth:
+    """
+    L'authentification est différée jusqu'au premier appel de get_service().
+    Credentials et document discovery sont partagés par fichier de
+    credentials (voir service_pool): plusieurs managers n'authentifient
+    qu'une fois.
+    """
     
     def __init__(self, credentials_file='credentials.json'):
         self.credentials_file = credentials_file
+        self.pool = get_service_pool(credentials_file)
         self.service = None
-        self._authenticate()
     
     def _authenticate(self):
         try:
-            scopes = ['https://www.googleapis.com/auth/spreadsheets']
-            creds = Credentials.from_service_account_file(
-                self.credentials_file, scopes=scopes
-            )
-            self.service = build('sheets', 'v4', credentials=creds)
-            print("✅ Connexion Google Sheets réussie")
+            first_connection = not self.pool.is_authenticated()
+            self.pool.get_service()
+            self.service = self.pool.service
+            if first_connection:
+                print("✅ Connexion Google Sheets réussie")
         except Exception as e:
             print(f"❌ Erreur authentification Google Sheets: {e}")
             raise
     
     def get_service(self):
+        """Service utilisable depuis n'importe quel thread (une connexion par thread)."""
         if not self.service:
-            raise Exception("Service Google Sheets non initialisé")
+            self._authenticate()
         return self.service
     
     def is_authenticated(self):
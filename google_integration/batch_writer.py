@@ -0,0 +1,78 @@
+"""
+Écriture groupée des analyses dans Google Sheets.
+"""
+
+import atexit
+import threading
+
+
+class GoogleBatchWriter:
+    """
+    Accumule les lignes d'analyse et les envoie en un seul appel append.
+    Le tampon est vidé quand il atteint max_rows, après flush_interval
+    secondes, à la fermeture (fin d'analyse) et à la sortie du programme.
+    """
+
+    def __init__(self, data_handler, sheet_name="Trading_Analysis", max_rows=50, flush_interval=10.0):
+        self.data_handler = data_handler
+        self.sheet_name = sheet_name
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.results = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        # Sérialise les envois (ordre des lignes) sans bloquer add() pendant l'appel réseau
+        self._send_lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+        atexit.register(self.close)
+
+    def add(self, symbol, row_data):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Writer Google Sheets déjà fermé")
+            self._pending.append((symbol, row_data))
+            full = len(self._pending) >= self.max_rows
+            if not full:
+                self._start_timer()
+        if full:
+            self.flush()
+        return True
+
+    def _start_timer(self):
+        if self._timer is None and self.flush_interval:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Envoie les lignes en attente; retourne {symbole: succès} pour ce lot."""
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._pending = self._pending, []
+            if not batch:
+                return {}
+
+            rows = [row for _, row in batch]
+            success = self.data_handler._append_rows_to_sheet(self.sheet_name, rows)
+            batch_results = {symbol: success for symbol, _ in batch}
+            with self._lock:
+                self.results.update(batch_results)
+
+        if success:
+            print(f"✅ {len(rows)} ligne(s) ajoutée(s) en un seul envoi")
+        else:
+            print(f"❌ Échec de l'envoi groupé ({len(rows)} ligne(s))")
+        return batch_results
+
+    def close(self):
+        """Vide le tampon et retourne les résultats de tous les envois."""
+        if self._closed:
+            return self.results
+        self.flush()
+        self._closed = True
+        atexit.unregister(self.close)
+        return self.results
@@ -7,6 +7,9 @@ class GoogleConfig:
     
     DEFAULT_CREDENTIALS_FILE = 'credentials.json'
     DEFAULT_SHEET_NAME = 'Trading_Analysis'
+    # À incrémenter à chaque changement d'en-têtes, de structure ou de formatage
+    SCHEMA_VERSION = 1
+    SCHEMA_METADATA_KEY = 'trading_agent_schema_version'
     GOOGLE_SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
     TRADING_COLUMNS = {
         'TIMESTAMP': 0,
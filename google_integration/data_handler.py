@@ -4,12 +4,15 @@ Gestion des données dans Google Sheets.
 
 from datetime import datetime
 
+from metrics import metrics
+
 
 class GoogleDataHandler:
     
-    def __init__(self, service, sheet_id):
+    def __init__(self, service, sheet_id, history_store=None):
         self.service = service
         self.sheet_id = sheet_id
+        self.history_store = history_store
     
     def append_analysis(self, symbol, analysis_data, analysis_type="Quick", sheet_name="Trading_Analysis"):
         if not self._validate_connection():
@@ -44,20 +47,27 @@ class GoogleDataHandler:
         ]
     
     def _append_row_to_sheet(self, sheet_name, row_data):
+        return self._append_rows_to_sheet(sheet_name, [row_data])
+    
+    def _append_rows_to_sheet(self, sheet_name, rows):
         try:
-            body = {'values': [row_data]}
+            body = {'values': rows}
             
-            self.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_id,
-                range=f"{sheet_name}!A:K",
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+            metrics.incr('sheets.api_calls')
+            with metrics.span('sheets.append'):
+                self.service.spreadsheets().values().append(
+                    spreadsheetId=self.sheet_id,
+                    range=f"{sheet_name}!A:K",
+                    valueInputOption='RAW',
+                    body=body
+                ).execute()
+            metrics.incr('sheets.rows_written', len(rows))
             
             return True
             
         except Exception as e:
-            print(f"❌ Erreur ajout ligne: {e}")
+            metrics.incr('sheets.errors')
+            print(f"❌ Erreur ajout ligne(s): {e}")
             return False
     
     def update_range(self, range_name, values):
@@ -67,12 +77,14 @@ class GoogleDataHandler:
         try:
             body = {'values': values}
             
-            self.service.spreadsheets().values().update(
-                spreadsheetId=self.sheet_id,
-                range=range_name,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+            metrics.incr('sheets.api_calls')
+            with metrics.span('sheets.update'):
+                self.service.spreadsheets().values().update(
+                    spreadsheetId=self.sheet_id,
+                    range=range_name,
+                    valueInputOption='RAW',
+                    body=body
+                ).execute()
             
             return True
             
@@ -85,10 +97,12 @@ class GoogleDataHandler:
             return None
         
         try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id,
-                range=range_name
-            ).execute()
+            metrics.incr('sheets.api_calls')
+            with metrics.span('sheets.read'):
+                result = self.service.spreadsheets().values().get(
+                    spreadsheetId=self.sheet_id,
+                    range=range_name
+                ).execute()
             
             return result.get('values', [])
             
@@ -96,7 +110,48 @@ class GoogleDataHandler:
             print(f"❌ Erreur lecture données: {e}")
             return None
     
+    def delete_row_ranges(self, sheet_gid, row_ranges):
+        """
+        Supprime des plages de lignes [début, fin[ (index 0 = en-tête) en un seul batchUpdate.
+        Les plages sont envoyées de la fin vers le début pour que les index restent valides.
+        """
+        if not self._validate_connection() or not row_ranges:
+            return False
+        
+        try:
+            requests = [{
+                'deleteDimension': {
+                    'range': {
+                        'sheetId': sheet_gid,
+                        'dimension': 'ROWS',
+                        'startIndex': start,
+                        'endIndex': end
+                    }
+                }
+            } for start, end in sorted(row_ranges, reverse=True)]
+            
+            metrics.incr('sheets.api_calls')
+            with metrics.span('sheets.batch_update'):
+                self.service.spreadsheets().batchUpdate(
+                    spreadsheetId=self.sheet_id,
+                    body={'requests': requests}
+                ).execute()
+            
+            if self.history_store:
+                self.history_store.reset(self.sheet_id)
+            return True
+            
+        except Exception as e:
+            print(f"❌ Erreur suppression lignes: {e}")
+            return False
+    
     def get_analysis_history(self, symbol=None, limit=10):
+        if self.history_store:
+            try:
+                self.history_store.sync(self)
+                return self.history_store.get_history(self.sheet_id, symbol, limit)
+            except Exception as e:
+                print(f"⚠️  Miroir local indisponible, lecture complète de la feuille: {e}")
         try:
             all_data = self.get_sheet_data("Trading_Analysis!A:K")
             if not all_data or len(all_data) <= 1:
@@ -110,6 +165,20 @@ class GoogleDataHandler:
             print(f"❌ Erreur récupération historique: {e}")
             return []
     
+    def get_recommendation_counts(self, limit=20):
+        """Répartition des recommandations sur les `limit` dernières analyses."""
+        if self.history_store:
+            try:
+                self.history_store.sync(self)
+                return self.history_store.count_recommendations(self.sheet_id, limit)
+            except Exception as e:
+                print(f"⚠️  Miroir local indisponible, lecture complète de la feuille: {e}")
+        counts = {}
+        for row in self.get_analysis_history(limit=limit):
+            if len(row) > 7:
+                counts[row[7]] = counts.get(row[7], 0) + 1
+        return counts
+    
     def _validate_connection(self):
         if not self.service or not self.sheet_id:
             print("❌ Service ou Sheet ID manquant")
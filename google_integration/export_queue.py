@@ -0,0 +1,106 @@
+"""
+File d'envoi asynchrone des analyses vers Google Sheets.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import metrics
+
+_STOP = object()
+
+
+class GoogleExportQueue:
+    """
+    Envoie les lignes d'analyse depuis un thread d'arrière-plan.
+    Les lignes disponibles sont regroupées (jusqu'à max_batch) dans un seul
+    appel append; un envoi en échec est retenté avec un délai exponentiel.
+    """
+
+    def __init__(self, data_handler, sheet_name="Trading_Analysis", maxsize=1000,
+                 max_batch=50, max_retries=5, base_delay=1.0, max_delay=30.0, put_timeout=5.0):
+        self.data_handler = data_handler
+        self.sheet_name = sheet_name
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.put_timeout = put_timeout
+        self.sent = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sheets-export", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, symbol, row_data):
+        """Met une ligne en file; retourne un Future résolu à True/False après l'envoi."""
+        future = Future()
+        if self._stopping.is_set():
+            future.set_result(False)
+            return future
+        try:
+            self._queue.put((symbol, row_data, future), timeout=self.put_timeout)
+        except queue.Full:
+            print(f"⚠️  File Google Sheets pleine, analyse de {symbol} ignorée")
+            self.failed += 1
+            future.set_result(False)
+        return future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop_after = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop_after = True
+                    break
+                batch.append(item)
+
+            self._send(batch)
+            if stop_after:
+                return
+
+    def _send(self, batch):
+        rows = [row for _, row, _ in batch]
+        success = False
+        for attempt in range(self.max_retries + 1):
+            success = self.data_handler._append_rows_to_sheet(self.sheet_name, rows)
+            if success or attempt == self.max_retries:
+                break
+            delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+            metrics.incr('sheets.retries')
+            print(f"🔄 Nouvel essai Google Sheets dans {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+        if success:
+            self.sent += len(batch)
+        else:
+            self.failed += len(batch)
+            symbols = ', '.join(symbol for symbol, _, _ in batch)
+            print(f"❌ Abandon de l'envoi Google Sheets pour: {symbols}")
+        for _, _, future in batch:
+            future.set_result(success)
+
+    def shutdown(self, timeout=None):
+        """Vide la file puis arrête le thread d'envoi. Retourne True si tout a été traité."""
+        if not self._stopping.is_set():
+            self._stopping.set()
+            atexit.unregister(self.shutdown)
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
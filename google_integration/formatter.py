@@ -130,49 +130,43 @@ class GoogleSheetsFormatter:
         ]
     
     @staticmethod
-    def apply_sheet_formatting(service, sheet_id, sheet_name, headers):
-        """Applique tout le formatage à une feuille"""
-        try:
-            sheet_internal_id = GoogleSheetsFormatter._get_sheet_id_by_name(
-                service, sheet_id, sheet_name
-            )
-            if sheet_internal_id is None:
-                print(f"⚠️  Impossible de trouver la feuille '{sheet_name}'")
-                return False
-            requests = []
-            requests.extend(GoogleSheetsFormatter.get_header_formatting_requests(
-                sheet_internal_id, len(headers)
-            ))
-            requests.extend(GoogleSheetsFormatter.get_sheet_structure_requests(
-                sheet_internal_id, len(headers)
-            ))
-            requests.extend(GoogleSheetsFormatter.get_conditional_formatting_requests(
-                sheet_internal_id
-            ))
-            service.spreadsheets().batchUpdate(
-                spreadsheetId=sheet_id,
-                body={'requests': requests}
-            ).execute()
-            print(f"✅ Formatage appliqué à '{sheet_name}'")
-            return True
-            
-        except Exception as e:
-            print(f"⚠️  Erreur formatage: {e}")
-            return False
+    def get_header_values_requests(sheet_id, headers):
+        """Génère la requête d'écriture des en-têtes (ligne 1)"""
+        return [{
+            'updateCells': {
+                'start': {'sheetId': sheet_id, 'rowIndex': 0, 'columnIndex': 0},
+                'rows': [{'values': [{'userEnteredValue': {'stringValue': header}} for header in headers]}],
+                'fields': 'userEnteredValue'
+            }
+        }]
     
     @staticmethod
-    def _get_sheet_id_by_name(service, spreadsheet_id, sheet_name):
-        """Récupère l'ID interne de la feuille par son nom"""
-        try:
-            sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-            sheets = sheet_metadata.get('sheets', [])
-            
-            for sheet in sheets:
-                if sheet['properties']['title'] == sheet_name:
-                    return sheet['properties']['sheetId']
-            
-            return None
-            
-        except Exception as e:
-            print(f"❌ Erreur récupération Sheet ID: {e}")
-            return None
+    def get_setup_requests(sheet_id, headers, new_sheet_title=None, existing_rules=0):
+        """
+        Toutes les requêtes de mise en place d'une feuille, pour un seul batchUpdate:
+        création (si new_sheet_title), en-têtes, formatage, structure et règles
+        conditionnelles (les existing_rules règles en place sont remplacées).
+        """
+        requests = []
+        if new_sheet_title:
+            requests.append({
+                'addSheet': {
+                    'properties': {
+                        'sheetId': sheet_id,
+                        'title': new_sheet_title,
+                        'gridProperties': {
+                            'rowCount': 1000,
+                            'columnCount': len(headers)
+                        }
+                    }
+                }
+            })
+        requests.extend(
+            {'deleteConditionalFormatRule': {'sheetId': sheet_id, 'index': 0}}
+            for _ in range(existing_rules)
+        )
+        requests.extend(GoogleSheetsFormatter.get_header_values_requests(sheet_id, headers))
+        requests.extend(GoogleSheetsFormatter.get_header_formatting_requests(sheet_id, len(headers)))
+        requests.extend(GoogleSheetsFormatter.get_sheet_structure_requests(sheet_id, len(headers)))
+        requests.extend(GoogleSheetsFormatter.get_conditional_formatting_requests(sheet_id))
+        return requests
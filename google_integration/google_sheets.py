@@ -2,11 +2,14 @@
 Module principal Google Sheets - Interface simplifiée et utilitaires.
 """
 
+from concurrent.futures import Future
+
 from .sheets_manager import GoogleSheetsManager
 from .auth import GoogleAuth
 from .data_handler import GoogleDataHandler
 from .formatter import GoogleSheetsFormatter
 from .config import GoogleConfig
+from .sheet_export import DEFAULT_PAGE_SIZE, SheetExporter
 
 
 class GoogleSheetsInterface:
@@ -29,7 +32,8 @@ class GoogleSheetsInterface:
             print(f"❌ Erreur configuration sheet: {e}")
             return False
     
-    def quick_add_analysis(self, symbol, price, decision, signals, volume=None, change_percent=None):
+    def quick_add_analysis(self, symbol, price, decision, signals, volume=None, change_percent=None,
+                           rsi=None, macd=None):
         if not self.is_configured:
             print("⚠️  Sheet non configuré")
             return False
@@ -37,8 +41,8 @@ class GoogleSheetsInterface:
         analysis_data = {
             'company': symbol,  # Sera remplacé par le nom si disponible
             'price': f"{price:.2f}",
-            'rsi': 'N/A',
-            'macd': 'N/A',
+            'rsi': f"{rsi:.1f}" if rsi is not None and rsi == rsi else 'N/A',
+            'macd': f"{macd:.3f}" if macd is not None and macd == macd else 'N/A',
             'signal': ', '.join(signals) if isinstance(signals, list) else str(signals),
             'recommendation': decision,
             'volume': f"{volume:.0f}" if volume else 'N/A',
@@ -57,22 +61,51 @@ class GoogleSheetsInterface:
         
         return self.manager.append_analysis(symbol, analysis_data, analysis_type, sheet_name)
     
+    def submit_analysis(self, symbol, analysis_data, analysis_type="Quick", sheet_name="Trading_Analysis"):
+        """Comme append_analysis, mais retourne un Future résolu à True/False après l'envoi."""
+        if not self.is_configured:
+            print("⚠️  Sheet non configuré")
+            future = Future()
+            future.set_result(False)
+            return future
+        return self.manager.submit_analysis(symbol, analysis_data, analysis_type, sheet_name)
+    
+    def open_batch(self, sheet_name="Trading_Analysis", max_rows=50, flush_interval=10.0):
+        if not self.is_configured:
+            print("⚠️  Sheet non configuré")
+            return None
+        return self.manager.open_batch(sheet_name, max_rows, flush_interval)
+    
+    def close_batch(self):
+        return self.manager.close_batch()
+    
+    def start_export_queue(self, sheet_name="Trading_Analysis", maxsize=1000, max_retries=5):
+        if not self.is_configured:
+            print("⚠️  Sheet non configuré")
+            return None
+        return self.manager.start_export_queue(sheet_name, maxsize, max_retries)
+    
+    def has_export_queue(self):
+        return self.manager.has_export_queue()
+    
+    def pending_exports(self):
+        return self.manager.pending_exports()
+    
+    def shutdown(self, timeout=None):
+        return self.manager.shutdown(timeout)
+    
     def get_trading_summary(self):
         if not self.is_configured:
             return None
         
         try:
-            # Récupérer les 20 dernières analyses
-            history = self.manager.get_analysis_history(limit=20)
-            if not history:
+            # Répartition des 20 dernières analyses, comptée par le miroir local
+            recommendations = self.manager.get_recommendation_counts(limit=20)
+            if not recommendations:
                 return None
-            recommendations = {}
-            for row in history:
-                if len(row) > 7:
-                    rec = row[7]
-                    recommendations[rec] = recommendations.get(rec, 0) + 1
+            history = self.manager.get_analysis_history(limit=1)
             return {
-                'total_analyses': len(history),
+                'total_analyses': sum(recommendations.values()),
                 'recommendations': recommendations,
                 'last_analysis': history[-1] if history else None
             }
@@ -95,38 +128,114 @@ class GoogleSheetsInterface:
             for rec, count in summary['recommendations'].items():
                 print(f"   • {rec}: {count}")
     
-    def export_to_csv(self, filename="trading_analysis.csv"):
+    def export_to_csv(self, filename="trading_analysis.csv", incremental=False, fmt=None,
+                      page_size=DEFAULT_PAGE_SIZE, sheet_name="Trading_Analysis"):
+        """
+        Exporte la feuille par pages vers filename (CSV, .csv.gz ou .parquet
+        selon l'extension, ou fmt). incremental=True n'ajoute que les lignes
+        écrites depuis le dernier export vers ce fichier.
+        Retourne {'file', 'format', 'rows', 'pages'} ou False.
+        """
+        if not self.is_configured:
+            print("⚠️  Sheet non configuré")
+            return False
+        
+        try:
+            exporter = SheetExporter(self.manager, sheet_name, page_size)
+            report = exporter.export(filename, fmt, incremental)
+            if incremental and not report['rows']:
+                print("ℹ️  Aucune nouvelle ligne depuis le dernier export")
+            else:
+                print(f"✅ {report['rows']} ligne(s) exportée(s) vers: {report['file']} ({report['format']})")
+            return report
+            
+        except ImportError as e:
+            print(f"❌ Export Parquet indisponible (pip install pyarrow): {e}")
+            return False
+        except Exception as e:
+            print(f"❌ Erreur export: {e}")
+            return False
+    
+    def clear_old_data(self, days_to_keep=30, archive=True, archive_dir="archives", sheet_name="Trading_Analysis"):
+        """
+        Supprime les analyses plus anciennes que days_to_keep jours.
+        Les lignes supprimées sont d'abord archivées dans un CSV compressé
+        (si archive=True), puis retirées en un seul batchUpdate.
+        Retourne {'rows_removed', 'bytes_removed', 'archive_file'} ou False.
+        """
         if not self.is_configured:
             print("⚠️  Sheet non configuré")
             return False
         
+        print("🔄 Nettoyage des anciennes données...")
         try:
             import csv
-            from datetime import datetime
+            import gzip
+            import io
+            import os
+            from datetime import datetime, timedelta
+            
+            data = self.manager.get_sheet_data(GoogleConfig.get_range_name(sheet_name))
+            if not data or len(data) <= 1:
+                print("ℹ️  Aucune donnée à nettoyer")
+                return {'rows_removed': 0, 'bytes_removed': 0, 'archive_file': None}
+            
+            cutoff = datetime.now() - timedelta(days=days_to_keep)
+            timestamp_col = GoogleConfig.TRADING_COLUMNS['TIMESTAMP']
+            old_indexes = []
+            for index, row in enumerate(data[1:], start=1):
+                try:
+                    row_time = datetime.strptime(row[timestamp_col], '%Y-%m-%d %H:%M:%S')
+                except (IndexError, ValueError):
+                    continue  # Horodatage illisible: on conserve la ligne
+                if row_time < cutoff:
+                    old_indexes.append(index)
+            
+            if not old_indexes:
+                print(f"✅ Rien à supprimer (conservation: {days_to_keep} jours)")
+                return {'rows_removed': 0, 'bytes_removed': 0, 'archive_file': None}
+            
+            # Regrouper les lignes consécutives en plages [début, fin[
+            row_ranges = []
+            for index in old_indexes:
+                if row_ranges and row_ranges[-1][1] == index:
+                    row_ranges[-1][1] = index + 1
+                else:
+                    row_ranges.append([index, index + 1])
             
-            data = self.manager.get_sheet_data("Trading_Analysis!A:K")
-            if not data:
-                print("❌ Aucune donnée à exporter")
+            old_rows = [data[index] for index in old_indexes]
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(old_rows)
+            payload = buffer.getvalue().encode('utf-8')
+            
+            archive_file = None
+            if archive:
+                os.makedirs(archive_dir, exist_ok=True)
+                archive_file = os.path.join(
+                    archive_dir, f"trading_analysis_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv.gz"
+                )
+                with gzip.open(archive_file, 'wb') as f:
+                    header = io.StringIO()
+                    csv.writer(header).writerow(data[0])
+                    f.write(header.getvalue().encode('utf-8'))
+                    f.write(payload)
+                print(f"📦 Archive créée: {archive_file}")
+            
+            if not self.manager.delete_row_ranges(sheet_name, [tuple(r) for r in row_ranges]):
                 return False
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"trading_analysis_{timestamp}.csv"
             
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows(data)
-            print(f"✅ Données exportées vers: {filename}")
-            return True
+            report = {
+                'rows_removed': len(old_rows),
+                'bytes_removed': len(payload),
+                'archive_file': archive_file
+            }
+            print(f"✅ {report['rows_removed']} ligne(s) supprimée(s) en {len(row_ranges)} plage(s), "
+                  f"{report['bytes_removed']:,} octets libérés (conservation: {days_to_keep} jours)")
+            return report
             
         except Exception as e:
-            print(f"❌ Erreur export CSV: {e}")
+            print(f"❌ Erreur nettoyage: {e}")
             return False
-    
-    def clear_old_data(self, days_to_keep=30):
-        """Supprime les données plus anciennes que X jours (fonctionnalité future)."""
-        print("🔄 Nettoyage des anciennes données...")
-        print(f"💡 Fonctionnalité à implémenter: garder {days_to_keep} jours")
-        # TODO: Implémenter la suppression des anciennes données
-        return True
 
 
 # Fonctions utilitaires pour la compatibilité
@@ -139,6 +248,7 @@ def create_google_sheets_interface(credentials_file='credentials.json'):
 def test_google_connection(credentials_file='credentials.json'):
     try:
         auth = GoogleAuth(credentials_file)
+        auth.get_service()
         return auth.is_authenticated()
     except Exception as e:
         print(f"❌ Test connexion échoué: {e}")
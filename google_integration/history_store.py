@@ -0,0 +1,155 @@
+"""
+Miroir local (SQLite) du journal des analyses Google Sheets.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_HISTORY_DB = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'analysis_history.sqlite'
+)
+
+COLUMNS = [
+    'timestamp', 'symbol', 'company', 'price', 'rsi', 'macd',
+    'signals', 'recommendation', 'volume', 'change_percent', 'analysis_type'
+]
+
+
+class AnalysisHistoryStore:
+    """
+    Copie indexée de la feuille Trading_Analysis. La synchronisation ne lit
+    que la dernière ligne déjà vue (pour vérifier qu'elle n'a pas bougé) et
+    les lignes suivantes.
+    """
+
+    def __init__(self, db_path=DEFAULT_HISTORY_DB, min_sync_interval=5.0):
+        self.db_path = db_path
+        self.min_sync_interval = min_sync_interval
+        self._lock = threading.Lock()
+        self._last_sync = 0.0
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    sheet_id TEXT NOT NULL,
+                    row_number INTEGER NOT NULL,
+                    {', '.join(f'{column} TEXT' for column in COLUMNS)},
+                    PRIMARY KEY (sheet_id, row_number)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_symbol ON analyses (sheet_id, symbol, row_number)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses (sheet_id, timestamp)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    sheet_id TEXT PRIMARY KEY,
+                    last_row INTEGER NOT NULL
+                )
+            """)
+
+    def last_row(self, sheet_id):
+        """Numéro de la dernière ligne de la feuille déjà copiée (1 = en-tête)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_row FROM sync_state WHERE sheet_id = ?", (sheet_id,)
+            ).fetchone()
+        return row[0] if row else 1
+
+    def _padded(self, row):
+        return [str(value) for value in (list(row) + [''] * len(COLUMNS))[:len(COLUMNS)]]
+
+    def _stored_row(self, sheet_id, row_number):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM analyses WHERE sheet_id = ? AND row_number = ?",
+                (sheet_id, row_number)
+            ).fetchone()
+        return list(row) if row else None
+
+    def sync(self, data_handler, sheet_name="Trading_Analysis", force=False):
+        """
+        Copie les nouvelles lignes de la feuille. Retourne le nombre de lignes ajoutées.
+        La dernière ligne copiée est relue avec les nouvelles: si elle a changé
+        (nettoyage de la feuille, modification manuelle), la copie est reconstruite.
+        """
+        if not force and time.monotonic() - self._last_sync < self.min_sync_interval:
+            return 0
+
+        sheet_id = data_handler.sheet_id
+        last_row = self.last_row(sheet_id)
+        start_row = last_row + 1
+        if last_row > 1:
+            rows = data_handler.get_sheet_data(f"{sheet_name}!A{last_row}:K")
+            if rows is None:
+                return 0
+            if rows and self._padded(rows[0]) == self._stored_row(sheet_id, last_row):
+                new_rows = rows[1:]
+            else:
+                self.reset(sheet_id)
+                start_row = 2
+                new_rows = data_handler.get_sheet_data(f"{sheet_name}!A{start_row}:K")
+        else:
+            new_rows = data_handler.get_sheet_data(f"{sheet_name}!A{start_row}:K")
+        if new_rows is None:
+            return 0
+        self._last_sync = time.monotonic()
+        if not new_rows:
+            return 0
+
+        records = [
+            (sheet_id, start_row + offset, *self._padded(row))
+            for offset, row in enumerate(new_rows)
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO analyses VALUES ({', '.join('?' * (len(COLUMNS) + 2))})",
+                records
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)",
+                (sheet_id, start_row + len(new_rows) - 1)
+            )
+        return len(records)
+
+    def reset(self, sheet_id):
+        """Oublie la copie locale; la prochaine synchronisation relit toute la feuille."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM analyses WHERE sheet_id = ?", (sheet_id,))
+            self._conn.execute("DELETE FROM sync_state WHERE sheet_id = ?", (sheet_id,))
+        self._last_sync = 0.0
+
+    def get_history(self, sheet_id, symbol=None, limit=10):
+        """Dernières analyses (dans l'ordre chronologique), au format des lignes de la feuille."""
+        query = f"SELECT {', '.join(COLUMNS)} FROM analyses WHERE sheet_id = ?"
+        params = [sheet_id]
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        query += " ORDER BY row_number DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [list(row) for row in reversed(rows)]
+
+    def count_recommendations(self, sheet_id, limit=20):
+        """Répartition des recommandations sur les `limit` dernières analyses."""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT recommendation, COUNT(*) FROM (
+                    SELECT recommendation FROM analyses WHERE sheet_id = ?
+                    ORDER BY row_number DESC LIMIT ?
+                ) GROUP BY recommendation
+            """, (sheet_id, limit)).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
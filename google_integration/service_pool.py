@@ -0,0 +1,92 @@
+"""
+Services Google Sheets partagés entre managers et threads.
+
+Un pool par fichier de credentials: les credentials (et leur jeton) et le
+document discovery de l'API sont chargés une seule fois; chaque thread
+reçoit son propre service, avec sa propre connexion HTTP persistante,
+car le transport httplib2 ne peut pas être partagé entre threads.
+"""
+
+import json
+import threading
+
+from .config import GoogleConfig
+
+HTTP_TIMEOUT = 60
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class GoogleServicePool:
+
+    def __init__(self, credentials_file, scopes=None):
+        self.credentials_file = credentials_file
+        self.scopes = scopes or GoogleConfig.GOOGLE_SHEETS_SCOPES
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._credentials = None
+        self._document = None
+        self.services_built = 0
+        self.service = ThreadLocalService(self)
+
+    def credentials(self):
+        """Credentials du compte de service, chargés une fois et partagés (jeton réutilisé)."""
+        with self._lock:
+            if self._credentials is None:
+                from google.oauth2.service_account import Credentials
+                self._credentials = Credentials.from_service_account_file(
+                    self.credentials_file, scopes=self.scopes
+                )
+            return self._credentials
+
+    def _discovery_document(self):
+        """Document discovery Sheets v4 embarqué, analysé une seule fois."""
+        with self._lock:
+            if self._document is None:
+                from googleapiclient.discovery_cache import get_static_doc
+                self._document = json.loads(get_static_doc('sheets', 'v4'))
+            return self._document
+
+    def get_service(self):
+        """Service propre au thread appelant, construit à sa première utilisation."""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            import google_auth_httplib2
+            import httplib2
+            from googleapiclient.discovery import build_from_document
+
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials(), http=httplib2.Http(timeout=HTTP_TIMEOUT)
+            )
+            service = build_from_document(self._discovery_document(), http=http)
+            self._local.service = service
+            with self._lock:
+                self.services_built += 1
+        return service
+
+    def is_authenticated(self):
+        return self._credentials is not None
+
+
+class ThreadLocalService:
+    """
+    S'utilise comme un service Google (service.spreadsheets()...) et délègue
+    au service du thread courant: un même objet peut être partagé entre le
+    thread principal, la file d'export et le tampon d'écriture.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._pool.get_service(), name)
+
+
+def get_service_pool(credentials_file='credentials.json'):
+    """Pool partagé pour un fichier de credentials."""
+    with _pools_lock:
+        pool = _pools.get(credentials_file)
+        if pool is None:
+            pool = _pools[credentials_file] = GoogleServicePool(credentials_file)
+        return pool
@@ -0,0 +1,265 @@
+"""
+Export en flux de la feuille des analyses (CSV, CSV gzip ou Parquet).
+
+La feuille est lue par pages de lignes: chaque page est typée, écrite puis
+oubliée, la mémoire reste donc constante quelle que soit la taille de la
+feuille. En mode incrémental, un fichier d'état à côté de l'export retient
+la dernière ligne exportée et seules les lignes suivantes sont lues.
+"""
+
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+
+from metrics import metrics
+from .config import GoogleConfig
+from .history_store import COLUMNS
+
+DEFAULT_PAGE_SIZE = 1000
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+FLOAT_COLUMNS = {'price', 'rsi', 'macd', 'change_percent'}
+INT_COLUMNS = {'volume'}
+
+
+def detect_format(filename):
+    """Format d'export d'après l'extension: 'csv', 'csv.gz' ou 'parquet'."""
+    name = filename.lower().rstrip('/\\')
+    if name.endswith('.parquet') or name.endswith('.pq'):
+        return 'parquet'
+    if name.endswith('.gz'):
+        return 'csv.gz'
+    return 'csv'
+
+def _parse_number(value, cast):
+    """'1,234.50', '2.15%', '$12' -> nombre; 'N/A', vide ou illisible -> None."""
+    if isinstance(value, (int, float)):
+        return cast(value)
+    text = str(value).strip().replace(',', '').replace('$', '').rstrip('%')
+    try:
+        return cast(float(text))
+    except ValueError:
+        return None
+
+def _parse_timestamp(value):
+    try:
+        return datetime.strptime(str(value), TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+def typed_row(row):
+    """Ligne de la feuille (chaînes) convertie en valeurs typées, dans l'ordre de COLUMNS."""
+    padded = (list(row) + [''] * len(COLUMNS))[:len(COLUMNS)]
+    typed = []
+    for column, value in zip(COLUMNS, padded):
+        if column == 'timestamp':
+            typed.append(_parse_timestamp(value))
+        elif column in FLOAT_COLUMNS:
+            typed.append(_parse_number(value, float))
+        elif column in INT_COLUMNS:
+            typed.append(_parse_number(value, int))
+        else:
+            typed.append(value if value != '' else None)
+    return typed
+
+
+class _CsvWriter:
+    """CSV (ou CSV gzip) en ajout: un fichier gzip à plusieurs membres reste lisible."""
+
+    def __init__(self, path, compressed, header):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if compressed:
+            self._file = gzip.open(path, 'at', newline='', encoding='utf-8')
+        else:
+            self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if not exists:
+            self._writer.writerow(header)
+
+    def write(self, rows):
+        self._writer.writerows(
+            [['' if value is None else value.strftime(TIMESTAMP_FORMAT) if isinstance(value, datetime) else value
+              for value in row] for row in rows]
+        )
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Un groupe de lignes Parquet par page."""
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        types = {'timestamp': pa.timestamp('s')}
+        types.update({column: pa.float64() for column in FLOAT_COLUMNS})
+        types.update({column: pa.int64() for column in INT_COLUMNS})
+        self._schema = pa.schema([(column, types.get(column, pa.string())) for column in COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self._writer.write_table(self._pa.table(
+            {column: list(values) for column, values in zip(COLUMNS, columns)}, schema=self._schema
+        ))
+
+    def close(self):
+        self._writer.close()
+
+
+class SheetExporter:
+    """Exporte une feuille page par page via un GoogleSheetsManager (ou tout objet exposant get_sheet_data)."""
+
+    def __init__(self, manager, sheet_name=GoogleConfig.DEFAULT_SHEET_NAME, page_size=DEFAULT_PAGE_SIZE):
+        self.manager = manager
+        self.sheet_name = sheet_name
+        self.page_size = page_size
+
+    def _read_rows(self, first_row, last_row):
+        rows = self.manager.get_sheet_data(f"{self.sheet_name}!A{first_row}:K{last_row}")
+        if rows is None:
+            raise RuntimeError(f"lecture des lignes {first_row}-{last_row} impossible")
+        return rows
+
+    def iter_pages(self, start_row=2):
+        """Pages (numéro de la première ligne, lignes) à partir de start_row (1 = en-tête)."""
+        row_number = start_row
+        while True:
+            rows = self._read_rows(row_number, row_number + self.page_size - 1)
+            if rows:
+                yield row_number, rows
+            if len(rows) < self.page_size:
+                return
+            row_number += self.page_size
+
+    @staticmethod
+    def _state_path(filename):
+        return f"{filename.rstrip('/')}.export.json"
+
+    def _load_state(self, filename):
+        try:
+            with open(self._state_path(filename), encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if state.get('sheet_id') == self.manager.sheet_id else None
+
+    def _save_state(self, filename, last_row, last_values):
+        state = {'sheet_id': self.manager.sheet_id, 'last_row': last_row, 'last_values': last_values}
+        tmp_path = f"{self._state_path(filename)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._state_path(filename))
+
+    def _resume_point(self, state):
+        """
+        (première ligne à lire, dernière ligne exportée à retrouver ou None).
+        Si la dernière ligne exportée a bougé (nettoyage de la feuille), on
+        relit depuis le début en ne gardant que ce qui la suit (voir _unexported).
+        """
+        if not state:
+            return 2, None
+        last_row, last_values = state['last_row'], state['last_values']
+        if self._read_rows(last_row, last_row) == [last_values]:
+            return last_row + 1, None
+        return 2, {
+            'timestamp': _parse_timestamp(last_values[0] if last_values else ''),
+            'values': last_values,
+            'found': False
+        }
+
+    @staticmethod
+    def _unexported(rows, resume):
+        """
+        Lignes postérieures au dernier export lors d'une relecture complète:
+        horodatage plus récent, ou même seconde mais placées après la dernière
+        ligne exportée (les analyses rapides écrivent plusieurs lignes par seconde).
+        """
+        kept = []
+        for row in rows:
+            timestamp = _parse_timestamp(row[0]) if row else None
+            if timestamp is None or timestamp < resume['timestamp']:
+                continue
+            if timestamp > resume['timestamp'] or resume['found']:
+                kept.append(row)
+            elif row == resume['values']:
+                resume['found'] = True
+        return kept
+
+    @staticmethod
+    def _remove_parts(directory, keep):
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith('part-') and name.endswith('.parquet') and path != keep:
+                os.remove(path)
+
+    def export(self, filename, fmt=None, incremental=False):
+        """
+        Exporte la feuille vers filename. Retourne {'file', 'format', 'rows', 'pages'}.
+        Export complet: fichier temporaire remplacé à la fin. Incrémental:
+        ajout en fin de CSV, ou nouveau fichier dans le dossier filename en Parquet.
+        """
+        fmt = fmt or detect_format(filename)
+        header = self._read_rows(1, 1)
+        header = header[0] if header else list(COLUMNS)
+
+        state = self._load_state(filename) if incremental else None
+        start_row, resume = self._resume_point(state)
+
+        if fmt == 'parquet' and incremental:
+            os.makedirs(filename, exist_ok=True)
+            target = os.path.join(filename, f"part-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet")
+        else:
+            target = filename
+        # L'ajout CSV écrit directement dans le fichier; les autres cas passent par un temporaire
+        appending = incremental and fmt != 'parquet'
+        path = target if appending else f"{target}.tmp"
+        if appending and state is None and os.path.exists(path):
+            os.remove(path)  # Pas d'état pour ce classeur: on repart d'un export complet
+
+        writer = None
+        report = {'file': target, 'format': fmt, 'rows': 0, 'pages': 0}
+        try:
+            with metrics.span('sheets.export'):
+                for first_row, rows in self.iter_pages(start_row):
+                    last_row, last_values = first_row + len(rows) - 1, rows[-1]
+                    if resume is not None and resume['timestamp'] is not None:
+                        rows = self._unexported(rows, resume)
+                    typed = [typed_row(row) for row in rows if row]
+                    if typed:
+                        if writer is None:
+                            writer = (_ParquetWriter(path) if fmt == 'parquet'
+                                      else _CsvWriter(path, fmt == 'csv.gz', header))
+                        writer.write(typed)
+                        report['rows'] += len(typed)
+                    report['pages'] += 1
+                    metrics.incr('sheets.export.rows', len(typed))
+                    if appending:
+                        self._save_state(filename, last_row, last_values)
+                if writer is None and not incremental:
+                    # Feuille vide: un export complet produit tout de même un fichier avec en-tête
+                    writer = _ParquetWriter(path) if fmt == 'parquet' else _CsvWriter(path, fmt == 'csv.gz', header)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            if not appending and os.path.exists(path):
+                os.remove(path)
+            raise
+
+        if writer is not None:
+            writer.close()
+            if not appending:
+                os.replace(path, target)
+        if fmt == 'parquet' and incremental and state is None:
+            # Pas d'état pour ce classeur: les anciens fichiers feraient doublon avec cet export complet
+            self._remove_parts(filename, target)
+        if incremental and not appending and report['pages']:
+            self._save_state(filename, last_row, last_values)
+        if not report['rows'] and incremental and fmt == 'parquet':
+            report['file'] = None
+        return report
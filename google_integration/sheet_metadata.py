@@ -0,0 +1,74 @@
+"""
+Cache local des métadonnées des Google Sheets (ID des onglets, version du schéma).
+"""
+
+import json
+import os
+import threading
+
+DEFAULT_METADATA_CACHE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'sheets_metadata.json'
+)
+
+# Masque de champs de la lecture de configuration: ni cellules ni formats détaillés
+SETUP_FIELDS = (
+    'properties.title,'
+    'sheets(properties(sheetId,title),conditionalFormats(ranges(sheetId))),'
+    'developerMetadata(metadataId,metadataKey,metadataValue)'
+)
+SHEET_IDS_FIELDS = 'properties.title,sheets.properties(sheetId,title)'
+
+
+class SheetMetadataCache:
+    """
+    Fichier JSON {spreadsheet_id: {'title', 'sheets': {nom: sheetId}, 'schema_version'}}.
+    Évite de relire les ID d'onglets pour chaque suppression de lignes ou
+    affichage des informations du classeur; rafraîchi à chaque préparation.
+    """
+
+    def __init__(self, path=DEFAULT_METADATA_CACHE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Cache des métadonnées non enregistré: {e}")
+
+    def get(self, spreadsheet_id):
+        with self._lock:
+            return self._load().get(spreadsheet_id)
+
+    def put(self, spreadsheet_id, entry):
+        with self._lock:
+            self._load()[spreadsheet_id] = entry
+            self._save()
+
+    def update_sheets(self, spreadsheet_id, title, sheets):
+        """Met à jour les ID d'onglets en conservant la version de schéma connue."""
+        with self._lock:
+            entry = self._load().setdefault(spreadsheet_id, {})
+            entry['title'] = title
+            entry['sheets'] = sheets
+            self._save()
+            return entry
+
+    def invalidate(self, spreadsheet_id):
+        with self._lock:
+            if self._load().pop(spreadsheet_id, None) is not None:
+                self._save()
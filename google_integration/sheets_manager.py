@@ -2,78 +2,235 @@
 Gestionnaire principal pour Google Sheets.
 """
 
+import zlib
+from concurrent.futures import Future
+
 from .auth import GoogleAuth
+from .batch_writer import GoogleBatchWriter
+from .export_queue import GoogleExportQueue
 from .data_handler import GoogleDataHandler
+from .config import GoogleConfig
 from .formatter import GoogleSheetsFormatter
+from .history_store import DEFAULT_HISTORY_DB, AnalysisHistoryStore
+from .sheet_metadata import SETUP_FIELDS, SHEET_IDS_FIELDS, SheetMetadataCache
+from metrics import metrics
 
 
 class GoogleSheetsManager:
     
-    def __init__(self, credentials_file='credentials.json'):
-        self.auth = GoogleAuth(credentials_file)
-        self.service = self.auth.get_service()
+    def __init__(self, credentials_file='credentials.json', service=None, metadata_cache=None,
+                 history_db=DEFAULT_HISTORY_DB):
+        # Un service fourni (ex: stand-in en mémoire des benchmarks) évite l'authentification
+        self.auth = None if service is not None else GoogleAuth(credentials_file)
+        self._service = service
         self.sheet_id = None
         self.data_handler = None
+        self.batch_writer = None
+        self.export_queue = None
+        self.history_store = self._open_history_store(history_db)
+        self.metadata_cache = metadata_cache or SheetMetadataCache()
+    
+    @property
+    def service(self):
+        """Service Google Sheets, authentifié à la première utilisation."""
+        if self._service is None:
+            self._service = self.auth.get_service()
+        return self._service
+    
+    def _open_history_store(self, history_db):
+        try:
+            return AnalysisHistoryStore(history_db)
+        except Exception as e:
+            print(f"⚠️  Miroir local de l'historique indisponible: {e}")
+            return None
     
     def set_spreadsheet(self, sheet_id):
         self.sheet_id = sheet_id
-        self.data_handler = GoogleDataHandler(self.service, sheet_id)
+        self.data_handler = GoogleDataHandler(self.service, sheet_id, self.history_store)
         print(f"📋 Sheet ID configuré: {sheet_id}")
     
-    def create_trading_sheet(self, sheet_name="Trading_Analysis"):
+    def create_trading_sheet(self, sheet_name="Trading_Analysis", force=False):
+        """
+        Prépare la feuille de façon idempotente. La version du schéma est
+        enregistrée dans les métadonnées développeur du classeur. Une seule
+        lecture avec masque de champs vérifie à chaque démarrage que l'onglet
+        et la version existent toujours (onglet supprimé ou renommé, métadonnées
+        effacées); un batchUpdate n'est envoyé que si la version a changé, ou
+        si force=True. Le cache local est rafraîchi au passage.
+        """
         if not self._validate_connection():
             return False
         
         try:
-            headers = GoogleSheetsFormatter.get_sheet_headers()
+            metrics.incr('sheets.api_calls')
+            metadata = self.service.spreadsheets().get(
+                spreadsheetId=self.sheet_id, fields=SETUP_FIELDS
+            ).execute()
+            sheets = {sheet['properties']['title']: sheet['properties']['sheetId'] for sheet in metadata.get('sheets', [])}
+            version_entry = next((
+                entry for entry in metadata.get('developerMetadata', [])
+                if entry.get('metadataKey') == GoogleConfig.SCHEMA_METADATA_KEY
+            ), None)
             
-            # Créer la structure de la feuille
-            if self._create_sheet_structure(sheet_name, headers):
-                # Appliquer le formatage
-                GoogleSheetsFormatter.apply_sheet_formatting(
-                    self.service, self.sheet_id, sheet_name, headers
-                )
-                print(f"✅ Sheet '{sheet_name}' créée et formatée avec succès")
-                return True
-            return False
+            if not force and version_entry and version_entry.get('metadataValue') == str(GoogleConfig.SCHEMA_VERSION) \
+                    and sheet_name in sheets:
+                print(f"✅ Sheet '{sheet_name}' déjà à jour (schéma v{GoogleConfig.SCHEMA_VERSION})")
+            else:
+                sheets[sheet_name] = self._apply_schema(sheet_name, metadata, sheets, version_entry)
+                print(f"✅ Sheet '{sheet_name}' créée et formatée avec succès (schéma v{GoogleConfig.SCHEMA_VERSION})")
+            
+            self.metadata_cache.put(self.sheet_id, {
+                'title': metadata.get('properties', {}).get('title', ''),
+                'sheets': sheets,
+                'schema_version': GoogleConfig.SCHEMA_VERSION
+            })
+            return True
             
         except Exception as e:
+            # Ne pas se fier à des identifiants d'onglets peut-être périmés
+            self.metadata_cache.invalidate(self.sheet_id)
             print(f"❌ Erreur création sheet: {e}")
             return False
     
-    def _create_sheet_structure(self, sheet_name, headers):
+    def _apply_schema(self, sheet_name, metadata, sheets, version_entry):
+        """Envoie structure, en-têtes, formatage et version en un seul batchUpdate. Retourne le sheetId."""
+        headers = GoogleSheetsFormatter.get_sheet_headers()
+        new_sheet = sheet_name not in sheets
+        if new_sheet:
+            # ID choisi ici pour pouvoir formater la feuille dans le même lot
+            sheet_gid = zlib.crc32(sheet_name.encode('utf-8')) & 0x7FFFFFFF
+            while sheet_gid in sheets.values():
+                sheet_gid = (sheet_gid + 1) & 0x7FFFFFFF
+            existing_rules = 0
+        else:
+            sheet_gid = sheets[sheet_name]
+            existing_rules = next((
+                len(sheet.get('conditionalFormats', [])) for sheet in metadata.get('sheets', [])
+                if sheet['properties']['sheetId'] == sheet_gid
+            ), 0)
+        
+        requests = GoogleSheetsFormatter.get_setup_requests(
+            sheet_gid, headers, new_sheet_title=sheet_name if new_sheet else None,
+            existing_rules=existing_rules
+        )
+        version = str(GoogleConfig.SCHEMA_VERSION)
+        if version_entry:
+            requests.append({'updateDeveloperMetadata': {
+                'dataFilters': [{'developerMetadataLookup': {'metadataId': version_entry['metadataId']}}],
+                'developerMetadata': {'metadataValue': version},
+                'fields': 'metadataValue'
+            }})
+        else:
+            requests.append({'createDeveloperMetadata': {'developerMetadata': {
+                'metadataKey': GoogleConfig.SCHEMA_METADATA_KEY,
+                'metadataValue': version,
+                'location': {'spreadsheet': True},
+                'visibility': 'DOCUMENT'
+            }}})
+        
+        metrics.incr('sheets.api_calls')
+        self.service.spreadsheets().batchUpdate(
+            spreadsheetId=self.sheet_id, body={'requests': requests}
+        ).execute()
+        return sheet_gid
+    
+    def get_sheet_gid(self, sheet_name):
+        """ID interne d'un onglet, depuis le cache local ou une lecture avec masque de champs."""
+        cached = self.metadata_cache.get(self.sheet_id) or {}
+        if sheet_name in cached.get('sheets', {}):
+            return cached['sheets'][sheet_name]
+        info = self._refresh_sheet_ids()
+        return info['sheets'].get(sheet_name) if info else None
+    
+    def _refresh_sheet_ids(self):
         try:
-            # Essayer de créer la feuille (ignorer si elle existe déjà)
-            body = {
-                'requests': [{
-                    'addSheet': {
-                        'properties': {
-                            'title': sheet_name,
-                            'gridProperties': {
-                                'rowCount': 1000,
-                                'columnCount': len(headers)
-                            }
-                        }
-                    }
-                }]
-            }
-            self.service.spreadsheets().batchUpdate(
-                spreadsheetId=self.sheet_id,
-                body=body
+            metrics.incr('sheets.api_calls')
+            metadata = self.service.spreadsheets().get(
+                spreadsheetId=self.sheet_id, fields=SHEET_IDS_FIELDS
             ).execute()
-            print(f"✅ Structure de '{sheet_name}' créée")
-            
         except Exception as e:
-            # La feuille existe peut-être déjà, c'est OK
-            print(f"ℹ️  Sheet '{sheet_name}' existe déjà")
-        return self.data_handler.update_range(f"{sheet_name}!A1:K1", [headers])
+            print(f"❌ Erreur récupération Sheet ID: {e}")
+            return None
+        sheets = {sheet['properties']['title']: sheet['properties']['sheetId'] for sheet in metadata.get('sheets', [])}
+        return self.metadata_cache.update_sheets(self.sheet_id, metadata.get('properties', {}).get('title', ''), sheets)
     
     def append_analysis(self, symbol, analysis_data, analysis_type="Quick", sheet_name="Trading_Analysis"):
+        """
+        Retourne un booléen. Avec la file d'arrière-plan active, True signifie
+        que la ligne a été acceptée par la file (voir submit_analysis pour
+        suivre l'envoi lui-même).
+        """
+        if self.export_queue and self.export_queue.sheet_name == sheet_name:
+            future = self.submit_analysis(symbol, analysis_data, analysis_type, sheet_name)
+            return not future.done() or future.result()
+        return self._append_now(symbol, analysis_data, analysis_type, sheet_name)
+    
+    def submit_analysis(self, symbol, analysis_data, analysis_type="Quick", sheet_name="Trading_Analysis"):
+        """
+        Comme append_analysis, mais retourne un Future résolu à True/False une
+        fois la ligne envoyée (immédiatement si la file d'arrière-plan n'est pas active).
+        """
+        if self.data_handler and self.export_queue and self.export_queue.sheet_name == sheet_name:
+            row_data = self.data_handler._prepare_analysis_row(symbol, analysis_data, analysis_type)
+            return self.export_queue.submit(symbol, row_data)
+        future = Future()
+        future.set_result(self._append_now(symbol, analysis_data, analysis_type, sheet_name))
+        return future
+    
+    def _append_now(self, symbol, analysis_data, analysis_type, sheet_name):
         if not self.data_handler:
             print("❌ Gestionnaire de données non initialisé")
             return False
+        if self.batch_writer and self.batch_writer.sheet_name == sheet_name:
+            row_data = self.data_handler._prepare_analysis_row(symbol, analysis_data, analysis_type)
+            return self.batch_writer.add(symbol, row_data)
         return self.data_handler.append_analysis(symbol, analysis_data, analysis_type, sheet_name)
     
+    def open_batch(self, sheet_name="Trading_Analysis", max_rows=50, flush_interval=10.0):
+        """Active l'écriture groupée: les append_analysis suivants sont mis en tampon."""
+        if not self.data_handler:
+            print("❌ Gestionnaire de données non initialisé")
+            return None
+        if self.export_queue:
+            # La file d'arrière-plan regroupe déjà les envois
+            return None
+        if self.batch_writer is None:
+            self.batch_writer = GoogleBatchWriter(self.data_handler, sheet_name, max_rows, flush_interval)
+        return self.batch_writer
+    
+    def close_batch(self):
+        """Vide le tampon et retourne {symbole: succès} pour toutes les lignes du lot."""
+        if self.batch_writer is None:
+            return {}
+        writer, self.batch_writer = self.batch_writer, None
+        return writer.close()
+    
+    def start_export_queue(self, sheet_name="Trading_Analysis", maxsize=1000, max_retries=5):
+        """Active l'envoi en arrière-plan (suivi des envois par submit_analysis)."""
+        if not self.data_handler:
+            print("❌ Gestionnaire de données non initialisé")
+            return None
+        if self.export_queue is None:
+            self.close_batch()
+            self.export_queue = GoogleExportQueue(
+                self.data_handler, sheet_name, maxsize=maxsize, max_retries=max_retries
+            )
+        return self.export_queue
+    
+    def has_export_queue(self):
+        return self.export_queue is not None
+    
+    def pending_exports(self):
+        return self.export_queue.pending() if self.export_queue else 0
+    
+    def shutdown(self, timeout=None):
+        """Vide le lot en cours et la file d'arrière-plan avant l'arrêt."""
+        self.close_batch()
+        if self.export_queue is None:
+            return True
+        export_queue, self.export_queue = self.export_queue, None
+        return export_queue.shutdown(timeout)
+    
     def get_sheet_data(self, range_name):
         if not self.data_handler:
             print("❌ Gestionnaire de données non initialisé")
@@ -86,6 +243,28 @@ class GoogleSheetsManager:
             return []
         return self.data_handler.get_analysis_history(symbol, limit)
     
+    def get_recommendation_counts(self, limit=20):
+        if not self.data_handler:
+            print("❌ Gestionnaire de données non initialisé")
+            return {}
+        return self.data_handler.get_recommendation_counts(limit)
+    
+    def delete_row_ranges(self, sheet_name, row_ranges):
+        if not self.data_handler:
+            print("❌ Gestionnaire de données non initialisé")
+            return False
+        if not row_ranges:
+            return False
+        sheet_gid = self.get_sheet_gid(sheet_name)
+        if sheet_gid is None:
+            print(f"⚠️  Impossible de trouver la feuille '{sheet_name}'")
+            return False
+        if not self.data_handler.delete_row_ranges(sheet_gid, row_ranges):
+            # ID d'onglet peut-être périmé: relire les métadonnées la prochaine fois
+            self.metadata_cache.invalidate(self.sheet_id)
+            return False
+        return True
+    
     def update_range(self, range_name, values):
         if not self.data_handler:
             print("❌ Gestionnaire de données non initialisé")
@@ -95,19 +274,16 @@ class GoogleSheetsManager:
     def get_sheet_info(self):
         if not self._validate_connection():
             return None
-        try:
-            sheet_metadata = self.service.spreadsheets().get(spreadsheetId=self.sheet_id).execute()
-            
-            info = {
-                'title': sheet_metadata['properties']['title'],
-                'sheets': [sheet['properties']['title'] for sheet in sheet_metadata.get('sheets', [])],
-                'url': f"https://docs.google.com/spreadsheets/d/{self.sheet_id}/edit"
-            }
-            return info
-            
-        except Exception as e:
-            print(f"❌ Erreur récupération info: {e}")
-            return None
+        cached = self.metadata_cache.get(self.sheet_id)
+        if not cached or 'title' not in cached:
+            cached = self._refresh_sheet_ids()
+            if cached is None:
+                return None
+        return {
+            'title': cached['title'],
+            'sheets': list(cached.get('sheets', {})),
+            'url': GoogleConfig.get_sheet_url(self.sheet_id)
+        }
     
     def print_sheet_info(self):
         info = self.get_sheet_info()
@@ -121,7 +297,7 @@ class GoogleSheetsManager:
             print("❌ Impossible de récupérer les informations du sheet")
     
     def _validate_connection(self):
-        if not self.service or not self.sheet_id:
+        if not self.sheet_id or not self.service:
             print("❌ Service ou Sheet ID manquant")
             return False
         return True
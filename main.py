@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
+import sys
+
 from src.app_config import initialize_app
-from src.google_sheets_config import setup_google_sheets_integration
+from src.google_sheets_config import setup_google_sheets_integration, shutdown_google_sheets
 from src.menu_system import run_main_menu
+from metrics import export_run_report
 
 def main():
     
+    sheets_manager = None
     try:
         modules = initialize_app()
         sheets_manager = setup_google_sheets_integration(modules)
@@ -15,6 +19,13 @@ def main():
     except Exception as e:
         print(f"\n❌ Erreur inattendue: {e}")
         print("💡 Veuillez redémarrer l'application.")
+    finally:
+        shutdown_google_sheets(sheets_manager)
+        export_run_report()
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Mode non interactif (scripts, cron): voir src/cli.py
+        from src.cli import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
     main()
@@ -0,0 +1,145 @@
+"""
+Instrumentation légère: durées par étape et compteurs.
+
+    from metrics import metrics
+
+    with metrics.span('fetch.yfinance'):
+        ...
+    metrics.incr('sheets.api_calls')
+
+Le rapport d'une exécution peut être exporté en JSON ou au format texte
+Prometheus (fichier lu par le node_exporter textfile collector, par exemple),
+ou simplement affiché.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+METRICS_ENV = 'TRADING_AGENT_METRICS'
+PROMETHEUS_PREFIX = 'trading_agent'
+
+
+class Metrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._counters = Counter()
+            self._started_at = datetime.now()
+            self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name):
+        """Mesure la durée du bloc et l'ajoute aux statistiques de l'étape `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Décorateur équivalent à span()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, name, seconds):
+        with self._lock:
+            stage = self._stages.setdefault(name, {'count': 0, 'total_s': 0.0, 'max_s': 0.0})
+            stage['count'] += 1
+            stage['total_s'] += seconds
+            stage['max_s'] = max(stage['max_s'], seconds)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self):
+        with self._lock:
+            stages = {
+                name: {**stage, 'mean_s': stage['total_s'] / stage['count']}
+                for name, stage in sorted(self._stages.items())
+            }
+            return {
+                'started_at': self._started_at.isoformat(timespec='seconds'),
+                'duration_s': time.perf_counter() - self._start,
+                'stages': stages,
+                'counters': dict(sorted(self._counters.items()))
+            }
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def to_prometheus(self):
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_seconds Durée des étapes instrumentées",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds summary",
+        ]
+        for name, stage in snapshot['stages'].items():
+            label = f'stage="{name}"'
+            lines.append(f"{PROMETHEUS_PREFIX}_stage_seconds_sum{{{label}}} {stage['total_s']:.6f}")
+            lines.append(f"{PROMETHEUS_PREFIX}_stage_seconds_count{{{label}}} {stage['count']}")
+        for name, value in snapshot['counters'].items():
+            metric = f"{PROMETHEUS_PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_run_duration_seconds gauge")
+        lines.append(f"{PROMETHEUS_PREFIX}_run_duration_seconds {snapshot['duration_s']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return path
+
+    def print_report(self):
+        snapshot = self.snapshot()
+        print(f"\n⏱️  RAPPORT D'EXÉCUTION ({snapshot['duration_s']:.1f}s)")
+        print("-" * 80)
+        for name, stage in snapshot['stages'].items():
+            print(f"   {name:<28} {stage['count']:>6} × {stage['mean_s'] * 1000:>9.1f} ms = {stage['total_s']:>8.2f} s")
+        for name, value in snapshot['counters'].items():
+            print(f"   {name:<28} {value:>6}")
+
+
+def export_run_report(path=None):
+    """
+    Écrit le rapport de l'exécution dans `path` (ou TRADING_AGENT_METRICS).
+    L'extension .prom produit le format Prometheus, toute autre du JSON;
+    '-' affiche le rapport texte à l'écran.
+    """
+    path = path or os.environ.get(METRICS_ENV)
+    if not path:
+        return None
+    try:
+        if path == '-':
+            metrics.print_report()
+        elif path.endswith('.prom'):
+            metrics.write_prometheus(path)
+        else:
+            metrics.to_json(path)
+        return path
+    except Exception as e:
+        print(f"⚠️  Écriture du rapport de métriques impossible: {e}")
+        return None
+
+
+metrics = Metrics()
@@ -4,7 +4,12 @@ Configuration et initialisation de l'application Trading Agent.
 
 import sys
 import os
+import time
 from datetime import datetime
+from importlib.util import find_spec
+
+# Durées des étapes de démarrage, en secondes
+STARTUP_TIMINGS = {}
 
 def setup_paths():
     """Configure les chemins d'accès pour les modules."""
@@ -23,9 +28,12 @@ def import_modules():
     try:
         # Imports principaux
         from stocks.portfolio import PERSO, BIGPHARMA, SMALLPHARMA
-        from stocks.get_data import get_stock_data
+        from stocks.get_data import get_stock_data, get_cache_stats
+        from stocks.providers import get_default_provider
         from src.calculate_signals import calculate_signals
         from src.quick_analyze import analyze_quick
+        from src.scan_planner import scan_portfolios
+        from src.watch_mode import watch_portfolio
         from src.detailed_analyze import analyze_detailed
         
         # Import Google Sheets avec gestion d'erreur améliorée
@@ -34,9 +42,11 @@ def import_modules():
         GoogleSheetsInterface = None
         
         try:
-            # Test d'abord si les dépendances Google sont disponibles
-            import google.oauth2.service_account
-            import googleapiclient.discovery
+            # Test d'abord si les dépendances Google sont disponibles, sans les
+            # charger: elles ne seront importées qu'à la première utilisation
+            for package in ('google.oauth2', 'googleapiclient'):
+                if _find_spec(package) is None:
+                    raise ImportError(f"No module named '{package}'")
             
             # Si OK, importer nos modules
             from google_integration.sheets_manager import GoogleSheetsManager
@@ -58,8 +68,12 @@ def import_modules():
             'BIGPHARMA': BIGPHARMA,
             'SMALLPHARMA': SMALLPHARMA,
             'get_stock_data': get_stock_data,
+            'get_cache_stats': get_cache_stats,
+            'data_provider': get_default_provider(),
             'calculate_signals': calculate_signals,
             'analyze_quick': analyze_quick,
+            'scan_portfolios': scan_portfolios,
+            'watch_portfolio': watch_portfolio,
             'analyze_detailed': analyze_detailed,
             'GoogleSheetsManager': GoogleSheetsManager,
             'GoogleSheetsInterface': GoogleSheetsInterface,
@@ -78,6 +92,12 @@ def import_modules():
         print("   pip install yfinance pandas")
         sys.exit(1)
 
+def _find_spec(name):
+    try:
+        return find_spec(name)
+    except (ImportError, ValueError):
+        return None
+
 def print_header():
     """Affiche l'en-tête de l'application."""
     print("=" * 80)
@@ -92,10 +112,9 @@ def check_dependencies():
     required_packages = ['yfinance', 'pandas']
     missing_packages = []
     
+    # Vérifier la présence sans importer: yfinance n'est chargé qu'au premier téléchargement
     for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+        if _find_spec(package) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -105,19 +124,32 @@ def check_dependencies():
     
     return True
 
+def _timed_step(name, func):
+    start = time.perf_counter()
+    result = func()
+    STARTUP_TIMINGS[name] = time.perf_counter() - start
+    return result
+
+def print_startup_report():
+    """Affiche le temps passé dans chaque étape du démarrage."""
+    total = sum(STARTUP_TIMINGS.values())
+    details = ", ".join(f"{name}: {seconds * 1000:.0f} ms" for name, seconds in STARTUP_TIMINGS.items())
+    print(f"⏱️  Démarrage en {total * 1000:.0f} ms ({details})")
+    print("   💤 yfinance et Google Sheets seront chargés à la première utilisation")
+
 def initialize_app():
     """Initialise complètement l'application."""
     print("🚀 Démarrage de Trading Agent Simple...")
     
     # Vérifier les dépendances
-    if not check_dependencies():
+    if not _timed_step('dépendances', check_dependencies):
         sys.exit(1)
     
     # Configurer les chemins
-    setup_paths()
+    _timed_step('chemins', setup_paths)
     
     # Importer les modules
-    modules = import_modules()
+    modules = _timed_step('imports', import_modules)
     
     # Afficher l'en-tête
     print_header()
@@ -127,5 +159,6 @@ def initialize_app():
     print(f"   ✅ Portefeuilles: PERSO ({len(modules['PERSO'])} stocks), BIGPHARMA ({len(modules['BIGPHARMA'])} stocks), SMALLPHARMA ({len(modules['SMALLPHARMA'])} stocks)")
     print(f"   ✅ Analyse: {bool(modules['analyze_quick'])}")
     print(f"   {'✅' if modules['google_sheets_available'] else '⚠️ '} Google Sheets: {modules['google_sheets_available']}")
+    print_startup_report()
     
     return modules
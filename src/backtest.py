@@ -0,0 +1,190 @@
+"""
+Backtest vectorisé de la stratégie 3 signaux MA20/MA50.
+
+Le nombre de signaux est calculé pour chaque barre de l'historique sur une
+matrice de prix (dates x symboles), puis converti en positions:
+ACHETER ouvre une position, VENDRE la ferme, ATTENDRE conserve la position
+en cours. Tous les calculs sont faits colonne par colonne par pandas/NumPy,
+sans boucle Python sur les barres.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stocks.get_data import DEFAULT_MAX_WORKERS
+from metrics import metrics
+from .calculate_signals import build_price_panel
+
+TRADING_DAYS = 252
+
+def on_own_calendar(prices, func):
+    """
+    Applique func (DataFrame -> DataFrame de même forme) à chaque symbole sur
+    ses seules barres cotées, puis remet les résultats à leurs dates (NaN les
+    jours sans cotation). Sur une matrice multi-places, un jour férié d'une
+    place ne vide plus les moyennes mobiles de ses symboles pendant 20/50 barres.
+    """
+    values = prices.to_numpy(dtype='float64')
+    order = np.argsort(~np.isnan(values), axis=0, kind='stable')
+    aligned = pd.DataFrame(np.take_along_axis(values, order, axis=0), columns=prices.columns)
+    result = np.empty_like(values)
+    np.put_along_axis(result, order, func(aligned).to_numpy(dtype='float64'), axis=0)
+    return pd.DataFrame(result, index=prices.index, columns=prices.columns)
+
+def _signal_counts(prices, short_window, long_window):
+    ma_short = prices.rolling(window=short_window).mean()
+    ma_long = prices.rolling(window=long_window).mean()
+
+    counts = (
+        (prices > ma_short).astype(int)
+        + (prices > ma_long).astype(int)
+        + (ma_short > ma_long).astype(int)
+    )
+    return counts.where(ma_short.notna())
+
+def compute_signal_counts(prices, short_window=20, long_window=50):
+    """
+    Nombre de signaux positifs (0 à 3) pour chaque barre; NaN tant que la MA
+    courte n'existe pas et les jours où le symbole n'est pas coté.
+    """
+    return on_own_calendar(prices, lambda aligned: _signal_counts(aligned, short_window, long_window))
+
+def signals_to_positions(counts, allow_short=False):
+    """
+    Convertit les signaux en positions. La position est prise à la clôture
+    de la barre du signal et s'applique au rendement de la barre suivante.
+    """
+    targets = pd.DataFrame(np.nan, index=counts.index, columns=counts.columns)
+    targets = targets.mask(counts == 3, 1.0)
+    targets = targets.mask(counts == 0, -1.0 if allow_short else 0.0)
+    return targets.ffill().fillna(0.0)
+
+def _max_drawdown(returns):
+    equity = (1 + returns.fillna(0)).cumprod()
+    return (equity / equity.cummax() - 1).min()
+
+def _trade_stats(positions, strategy_returns):
+    """Taux de réussite et nombre de trades, par symbole, à partir des périodes en position."""
+    held = positions.shift(1).fillna(0.0)
+    entries = (held != 0) & (held != held.shift(1).fillna(0.0))
+    trade_ids = entries.cumsum().where(held != 0)
+
+    log_returns = np.log1p(strategy_returns.fillna(0.0))
+    stacked = pd.DataFrame({
+        'trade': trade_ids.stack(),
+        'log_return': log_returns.stack()
+    }).dropna()
+    if stacked.empty:
+        zeros = pd.Series(0, index=positions.columns)
+        return zeros.astype(float), zeros
+
+    per_trade = stacked.groupby([stacked.index.get_level_values(1), 'trade'])['log_return'].sum()
+    trades = per_trade.groupby(level=0).size().reindex(positions.columns, fill_value=0)
+    hit_rate = (per_trade > 0).groupby(level=0).mean().reindex(positions.columns, fill_value=0.0)
+    return hit_rate, trades
+
+def _summarize(returns, positions=None):
+    """Statistiques de performance par colonne d'une matrice de rendements."""
+    # Durée propre à chaque colonne: barres où le symbole est coté
+    years = returns.notna().sum().replace(0, np.nan) / TRADING_DAYS
+    total_return = (1 + returns.fillna(0)).prod() - 1
+    volatility = returns.std() * np.sqrt(TRADING_DAYS)
+    stats = pd.DataFrame({
+        'total_return': total_return,
+        'cagr': (1 + total_return) ** (1 / years) - 1,
+        'volatility': volatility,
+        'sharpe': returns.mean() * TRADING_DAYS / volatility.replace(0, np.nan),
+        'max_drawdown': returns.apply(_max_drawdown)
+    })
+    if positions is not None:
+        stats['hit_rate'], stats['trades'] = _trade_stats(positions, returns)
+        stats['turnover'] = positions.diff().abs().sum() / years
+        # Rapportée aux barres où le symbole est coté (rendement non NaN)
+        stats['exposure'] = (positions.shift(1).fillna(0.0) != 0).where(returns.notna()).mean()
+    return stats
+
+def run_backtest(prices, cost=0.0, allow_short=False, short_window=20, long_window=50):
+    """
+    Backtest sur une matrice de prix de clôture (dates x symboles).
+    cost est le coût par unité de rotation (ex: 0.001 = 10 points de base).
+
+    Retourne un dict: counts, positions, returns (stratégie), stats (par symbole).
+    """
+    prices = prices.sort_index()
+    with metrics.span('backtest.signals'):
+        counts = compute_signal_counts(prices, short_window, long_window)
+    positions = signals_to_positions(counts, allow_short)
+
+    asset_returns = on_own_calendar(prices, lambda aligned: aligned.pct_change(fill_method=None))
+    turnover = positions.diff().abs().fillna(positions.abs())
+    strategy_returns = positions.shift(1).fillna(0.0) * asset_returns.fillna(0.0) - cost * turnover
+    strategy_returns = strategy_returns.where(prices.notna())
+
+    return {
+        'counts': counts,
+        'positions': positions,
+        'returns': strategy_returns,
+        'stats': _summarize(strategy_returns, positions)
+    }
+
+def backtest_portfolios(portfolios, prices, cost=0.0, allow_short=False):
+    """
+    Backtest de plusieurs portefeuilles ({nom: {symbole: société}}) sur une
+    même matrice de prix. Chaque symbole n'est calculé qu'une fois; le
+    rendement d'un portefeuille est la moyenne équipondérée de ses symboles.
+
+    Retourne un dict: symbols (stats par symbole), portfolios (stats par portefeuille).
+    """
+    result = run_backtest(prices, cost, allow_short)
+    symbol_stats = result['stats']
+    portfolio_returns = {}
+    trade_stats = {}
+    for name, portfolio in portfolios.items():
+        columns = [symbol for symbol in portfolio if symbol in result['returns'].columns]
+        if columns:
+            portfolio_returns[name] = result['returns'][columns].mean(axis=1)
+            members = symbol_stats.loc[columns]
+            trades = members['trades'].sum()
+            trade_stats[name] = {
+                'hit_rate': (members['hit_rate'] * members['trades']).sum() / trades if trades else 0.0,
+                'trades': trades,
+                # Poids égaux: la rotation du portefeuille est la moyenne de celles des symboles
+                'turnover': members['turnover'].mean()
+            }
+
+    portfolio_stats = pd.DataFrame()
+    if portfolio_returns:
+        portfolio_stats = _summarize(pd.DataFrame(portfolio_returns)).join(pd.DataFrame(trade_stats).T)
+    return {
+        'symbols': symbol_stats,
+        'portfolios': portfolio_stats,
+        'returns': result['returns']
+    }
+
+def load_price_panel(symbols, provider, years=10, max_workers=DEFAULT_MAX_WORKERS):
+    """Charge l'historique de clôture de plusieurs symboles en une matrice de prix."""
+    if hasattr(provider, 'close_panel'):
+        # Stockage en colonnes: matrice déjà alignée, sans copie
+        return provider.close_panel(symbols).iloc[-years * TRADING_DAYS:]
+    with metrics.span('backtest.fetch'):
+        frames = provider.fetch_portfolio_data(
+            list(dict.fromkeys(symbols)), days=years * TRADING_DAYS, max_workers=max_workers
+        )
+    return build_price_panel({symbol: data for symbol, data in frames if data is not None})
+
+def print_backtest_report(result):
+    print("\n📈 BACKTEST - STRATÉGIE 3 SIGNAUX MA20/MA50")
+    print("=" * 80)
+    print(f"{'Symbol':<8} | {'Rendement':>10} | {'CAGR':>7} | {'Max DD':>8} | {'Réussite':>8} | {'Trades':>6} | {'Rotation':>8}")
+    print("-" * 80)
+    for symbol, row in result['symbols'].iterrows():
+        print(f"{symbol:<8} | {row['total_return']:>+10.1%} | {row['cagr']:>+7.1%} | {row['max_drawdown']:>8.1%} | "
+              f"{row['hit_rate']:>8.0%} | {int(row['trades']):>6} | {row['turnover']:>8.1f}")
+
+    if not result['portfolios'].empty:
+        print("\n📊 PORTEFEUILLES:")
+        print("-" * 80)
+        for name, row in result['portfolios'].iterrows():
+            print(f"{name:<12} | Rendement {row['total_return']:+.1%} | CAGR {row['cagr']:+.1%} | "
+                  f"Max DD {row['max_drawdown']:.1%} | Sharpe {row['sharpe']:.2f} | "
+                  f"Réussite {row['hit_rate']:.0%} | Rotation {row['turnover']:.1f}")
@@ -2,40 +2,115 @@
 Calcul des signaux de trading
 """
 
+import numpy as np
 import pandas as pd
 
+from stocks.cache import normalize_index
+from metrics import metrics
+from .indicators import INDICATOR_COLUMNS, _align_to_last_row, compute_indicators
+
+BUY = "🟢 ACHETER"
+WAIT = "🟡 ATTENDRE"
+SELL = "🔴 VENDRE"
+
 def calculate_signals(data):
 
     if data is None or len(data) < 20:
         return None
-    
-    data['MA20'] = data['Close'].rolling(window=20).mean()
-    data['MA50'] = data['Close'].rolling(window=50).mean()
+
+    with metrics.span('signals.rolling'):
+        data['MA20'] = data['Close'].rolling(window=20).mean()
+        data['MA50'] = data['Close'].rolling(window=50).mean()
     latest = data.iloc[-1]
-    price = latest['Close']
-    ma20 = latest['MA20']
-    ma50 = latest['MA50']
-    if pd.isna(ma20):
+    analysis = evaluate_signals(latest['Close'], latest['MA20'], latest['MA50'])
+    if analysis:
+        with metrics.span('signals.indicators'):
+            analysis.update(compute_indicators(data['Close']))
+    return analysis
+
+def evaluate_signals(price, ma20, ma50):
+    """Évalue les 3 signaux et la décision à partir du prix et des moyennes mobiles."""
+    if ma20 is None or pd.isna(ma20):
         return None
+    if ma50 is not None and pd.isna(ma50):
+        ma50 = None
     signals = []
     if price > ma20:
         signals.append("Prix > MA20")
-    if not pd.isna(ma50) and price > ma50:
+    if ma50 is not None and price > ma50:
         signals.append("Prix > MA50")
-    if not pd.isna(ma50) and ma20 > ma50:
+    if ma50 is not None and ma20 > ma50:
         signals.append("MA20 > MA50")
     signal_count = len(signals)
     if signal_count == 3:
-        decision = "🟢 ACHETER"
+        decision = BUY
     elif signal_count == 0:
-        decision = "🔴 VENDRE"
+        decision = SELL
     else:
-        decision = "🟡 ATTENDRE"
+        decision = WAIT
     return {
         'price': price,
         'ma20': ma20,
-        'ma50': ma50 if not pd.isna(ma50) else None,
+        'ma50': ma50,
         'signals': signals,
         'signal_count': signal_count,
         'decision': decision
     }
+
+def build_price_panel(frames, column='Close'):
+    """
+    Construit une matrice de prix (dates x symboles) à partir de {symbole: DataFrame}.
+    Les index sont ramenés à des dates sans fuseau pour que des places
+    différentes partagent les mêmes lignes.
+    """
+    return pd.concat(
+        {symbol: normalize_index(data)[column] for symbol, data in frames.items() if data is not None},
+        axis=1
+    ).sort_index()
+
+def calculate_signals_panel(prices):
+    """
+    Version vectorisée de calculate_signals sur une matrice de prix
+    (dates x symboles). Retourne un DataFrame indexé par symbole avec les
+    colonnes price, ma20, ma50, les trois signaux booléens, signal_count,
+    decision et les indicateurs (INDICATOR_COLUMNS). Les symboles sans
+    données suffisantes sont exclus.
+    """
+    if prices is None or prices.empty:
+        return pd.DataFrame(columns=[
+            'price', 'ma20', 'ma50', 'price_above_ma20', 'price_above_ma50',
+            'ma20_above_ma50', 'signal_count', 'decision'
+        ] + INDICATOR_COLUMNS)
+
+    metrics.incr('signals.panel_symbols', prices.shape[1])
+    values = _align_to_last_row(prices.to_numpy(dtype='float64'))
+    aligned = pd.DataFrame(values, columns=prices.columns)
+
+    counts = np.count_nonzero(~np.isnan(values), axis=0)
+    price = values[-1]
+    ma20 = aligned.rolling(window=20).mean().to_numpy()[-1]
+    ma50 = aligned.rolling(window=50).mean().to_numpy()[-1]
+
+    has_ma50 = ~np.isnan(ma50)
+    above_ma20 = price > ma20
+    above_ma50 = has_ma50 & (price > ma50)
+    ma20_above_ma50 = has_ma50 & (ma20 > ma50)
+    signal_count = above_ma20.astype(int) + above_ma50.astype(int) + ma20_above_ma50.astype(int)
+    decision = np.select([signal_count == 3, signal_count == 0], [BUY, SELL], default=WAIT)
+
+    result = pd.DataFrame({
+        'price': price,
+        'ma20': ma20,
+        'ma50': ma50,
+        'price_above_ma20': above_ma20,
+        'price_above_ma50': above_ma50,
+        'ma20_above_ma50': ma20_above_ma50,
+        'signal_count': signal_count,
+        'decision': decision
+    }, index=prices.columns)
+
+    with metrics.span('signals.indicators'):
+        result = result.join(compute_indicators(aligned, aligned=True))
+
+    valid = (counts >= 20) & ~np.isnan(ma20)
+    return result[valid]
@@ -0,0 +1,335 @@
+"""
+Mode ligne de commande non interactif (scripts, cron).
+
+    python main.py quick --portfolio ALL --format json
+    python main.py detailed --symbols AAPL NVDA --format table
+    python main.py backtest --portfolio PERSO --years 10 --format csv
+    python main.py sweep --portfolio ALL --short 5 60 5 --long 20 210 10 --jobs 4
+    python main.py export --sheet-id <ID> --output analyses.csv
+    python main.py export --sheet-id <ID> --output analyses.parquet --incremental
+
+Les messages de progression sont écrits sur stderr, les résultats sur
+stdout (ou dans --output), pour pouvoir être redirigés vers d'autres outils.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import math
+import sys
+
+from stocks.portfolio import PORTFOLIOS
+from stocks.get_data import DEFAULT_MAX_WORKERS
+from metrics import export_run_report, metrics
+from src.rolling_stats import HISTORY_BARS
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+
+def _split_symbols(values):
+    symbols = []
+    for value in values or []:
+        symbols.extend(part.strip().upper() for part in value.split(',') if part.strip())
+    return list(dict.fromkeys(symbols))
+
+def resolve_targets(portfolio_names, symbols):
+    """
+    Retourne {nom de portefeuille: {symbole: société}} à partir des options
+    --portfolio et --symbols, ainsi que la liste des symboles inconnus.
+    """
+    names = list(portfolio_names or [])
+    if 'ALL' in names:
+        names = list(PORTFOLIOS)
+    if not names and not symbols:
+        names = ['PERSO']
+
+    if not names:
+        known = {}
+        for portfolio in PORTFOLIOS.values():
+            known.update(portfolio)
+        return {'CUSTOM': {symbol: known.get(symbol, symbol) for symbol in symbols}}, []
+
+    targets = {}
+    unknown = set(symbols)
+    for name in dict.fromkeys(names):
+        portfolio = PORTFOLIOS[name]
+        if symbols:
+            portfolio = {symbol: company for symbol, company in portfolio.items() if symbol in symbols}
+            unknown -= set(portfolio)
+        if portfolio:
+            targets[name] = portfolio
+    return targets, sorted(unknown)
+
+def _json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def _json_safe(value):
+    """NaN et infinis -> None: JSON strict (jq, JSON.parse) n'accepte pas NaN."""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if hasattr(value, 'item') and hasattr(value, 'dtype'):
+        value = value.item()  # Scalaires NumPy
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def _format_cell(value):
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(v) for v in value)
+    return str(value)
+
+def emit(rows, fmt, out, columns=None):
+    """Écrit des lignes (liste de dicts) au format table, csv ou json."""
+    columns = columns or (list(rows[0]) if rows else [])
+    if fmt == 'json':
+        json.dump(_json_safe(rows), out, indent=2, ensure_ascii=False, allow_nan=False, default=_json_default)
+        out.write("\n")
+    elif fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: _format_cell(row.get(key, '')) for key in columns})
+    else:
+        cells = [[_format_cell(row.get(key, '')) for key in columns] for row in rows]
+        widths = [max([len(key)] + [len(line[i]) for line in cells]) for i, key in enumerate(columns)]
+        out.write(" | ".join(key.ljust(width) for key, width in zip(columns, widths)) + "\n")
+        out.write("-+-".join("-" * width for width in widths) + "\n")
+        for line in cells:
+            out.write(" | ".join(cell.ljust(width) for cell, width in zip(line, widths)) + "\n")
+
+def _write_results(rows, fmt, out, report=None):
+    """Rapport texte de la commande en format table s'il existe, sinon emit."""
+    if fmt == 'table' and report is not None:
+        with contextlib.redirect_stdout(out):
+            report()
+    else:
+        emit(rows, fmt, out)
+
+def _open_sheets(args):
+    """Ouvre Google Sheets si --sheet-id est fourni, sinon retourne None."""
+    if not getattr(args, 'sheet_id', None):
+        return None
+    from google_integration.google_sheets import GoogleSheetsInterface
+    sheets = GoogleSheetsInterface(args.credentials)
+    if not sheets.setup_sheet(args.sheet_id):
+        raise RuntimeError("Configuration Google Sheets impossible")
+    return sheets
+
+HISTORY_DAYS = {'quick': 60, 'detailed': HISTORY_BARS}
+
+def _get_provider(args, targets):
+    from stocks.providers import LocalFileProvider, get_default_provider
+    if getattr(args, 'data_dir', None):
+        provider = LocalFileProvider(args.data_dir)
+    else:
+        provider = get_default_provider()
+    if getattr(args, 'compact', False):
+        from src.scan_planner import plan_scan
+        from stocks.price_store import PriceStore
+        days = HISTORY_DAYS.get(args.command) or args.years * 252
+        provider = PriceStore.from_provider(plan_scan(targets)['symbols'], provider, days=days, max_workers=args.jobs)
+        print(f"🗜️  Stockage compact: {len(provider)} symboles, {provider.nbytes / 1e6:.1f} Mo")
+    return provider
+
+def cmd_quick(args, targets, provider, sheets):
+    from src.scan_planner import scan_portfolios
+
+    rows, failed = [], []
+    # Les symboles communs à plusieurs portefeuilles ne sont analysés qu'une fois
+    reports = scan_portfolios(targets, sheets, max_workers=args.jobs, provider=provider)
+    for name, portfolio in targets.items():
+        results = reports[name]
+        analysed = {result['Symbol'] for result in results}
+        failed.extend(symbol for symbol in portfolio if symbol not in analysed)
+        for result in results:
+            rows.append({
+                'portfolio': name,
+                'symbol': result['Symbol'],
+                'name': result['Name'],
+                'price': result['Price'],
+                'change_percent': result['Change'],
+                'decision': result['Decision'],
+                'signal_count': int(result['Signals'].split('/')[0]),
+                'signals': result['SignalList'],
+                'rsi': result['RSI'],
+                'macd': result['MACD']
+            })
+    return rows, failed, None
+
+def cmd_detailed(args, targets, provider, sheets):
+    from src.detailed_analyze import analyze_detailed
+    from src.rolling_stats import horizon_stats_batch
+    from src.scan_planner import plan_scan
+
+    rows, failed = [], []
+    plan = plan_scan(targets)
+    symbols = plan['symbols']
+    # Précharger en parallèle, une fois par symbole: les analyses détaillées lisent ensuite le cache
+    frames = provider.fetch_portfolio_data(symbols, days=HISTORY_BARS, max_workers=args.jobs)
+    # Statistiques multi-horizons de tout le lot en une passe
+    batch = horizon_stats_batch(dict(frames))
+    # Les symboles communs à plusieurs portefeuilles ne sont analysés et sauvegardés qu'une fois
+    results = {}
+    for symbol in symbols:
+        stats = batch.loc[symbol].to_dict() if symbol in batch.index else None
+        results[symbol] = analyze_detailed(symbol, sheets, provider=provider, portfolio=symbols, stats=stats)
+        if results[symbol] is None:
+            failed.append(symbol)
+    for name, portfolio in targets.items():
+        for symbol, company in portfolio.items():
+            if results[symbol] is not None:
+                rows.append({'portfolio': name, **results[symbol], 'company': company})
+    return rows, failed, None
+
+def cmd_backtest(args, targets, provider, sheets):
+    from src.backtest import backtest_portfolios, load_price_panel, print_backtest_report
+
+    symbols = [symbol for portfolio in targets.values() for symbol in portfolio]
+    prices = load_price_panel(symbols, provider, years=args.years, max_workers=args.jobs)
+    failed = [symbol for symbol in dict.fromkeys(symbols) if symbol not in prices.columns]
+    if prices.empty:
+        return [], failed, None
+
+    result = backtest_portfolios(targets, prices, cost=args.cost)
+    rows = [{'level': 'symbol', 'name': symbol, **stats} for symbol, stats in result['symbols'].to_dict('index').items()]
+    rows += [{'level': 'portfolio', 'name': name, **stats} for name, stats in result['portfolios'].to_dict('index').items()]
+    return rows, failed, lambda: print_backtest_report(result)
+
+def cmd_sweep(args, targets, provider, sheets):
+    from src.backtest import load_price_panel
+    from src.param_sweep import build_window_grid, print_sweep_report, run_sweep
+
+    symbols = [symbol for portfolio in targets.values() for symbol in portfolio]
+    prices = load_price_panel(symbols, provider, years=args.years, max_workers=args.jobs)
+    failed = [symbol for symbol in dict.fromkeys(symbols) if symbol not in prices.columns]
+    if prices.empty:
+        return [], failed, None
+
+    # Tous les symboles choisis en un seul portefeuille équipondéré
+    table = run_sweep(prices, build_window_grid(range(*args.short), range(*args.long)),
+                      cost=args.cost, processes=args.jobs)
+    top = args.top or len(table)
+    rows = [{'rank': rank, **row} for rank, row in enumerate(table.head(top).to_dict('records'), 1)]
+    return rows, failed, lambda: print_sweep_report(table, top=top)
+
+def cmd_export(args):
+    from google_integration.google_sheets import GoogleSheetsInterface
+
+    sheets = GoogleSheetsInterface(args.credentials)
+    if not sheets.setup_sheet(args.sheet_id):
+        return EXIT_FAILURE
+    report = sheets.export_to_csv(args.output, incremental=args.incremental, page_size=args.page_size)
+    return EXIT_OK if report else EXIT_FAILURE
+
+COMMANDS = {
+    'quick': cmd_quick,
+    'detailed': cmd_detailed,
+    'backtest': cmd_backtest,
+    'sweep': cmd_sweep,
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Trading Agent Simple - mode non interactif")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--portfolio', action='append', choices=list(PORTFOLIOS) + ['ALL'],
+                        help="Portefeuille à analyser (répétable, ALL pour tous)")
+    common.add_argument('--symbols', nargs='+', help="Symboles à analyser (séparés par des espaces ou des virgules)")
+    common.add_argument('--format', choices=['table', 'json', 'csv'], default='table', help="Format de sortie")
+    common.add_argument('--jobs', type=int, default=DEFAULT_MAX_WORKERS, help="Téléchargements en parallèle")
+    common.add_argument('--output', '-o', help="Fichier de sortie (stdout par défaut)")
+    common.add_argument('--data-dir', help="Répertoire de données locales (SYMBOLE.parquet/csv)")
+    common.add_argument('--compact', action='store_true',
+                        help="Charger les données dans le stockage compact en colonnes (grands univers)")
+    common.add_argument('--metrics', help="Rapport de métriques de l'exécution (.json, .prom pour Prometheus, - pour l'afficher)")
+
+    sheets = argparse.ArgumentParser(add_help=False)
+    sheets.add_argument('--sheet-id', help="Sauvegarder les analyses dans cette Google Sheet")
+    sheets.add_argument('--credentials', default='credentials.json', help="Fichier credentials Google")
+
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('quick', parents=[common, sheets], help="Analyse rapide")
+    subparsers.add_parser('detailed', parents=[common, sheets], help="Analyse détaillée de chaque symbole")
+    backtest = subparsers.add_parser('backtest', parents=[common], help="Backtest de la stratégie MA20/MA50")
+    backtest.add_argument('--years', type=int, default=10, help="Années d'historique")
+    backtest.add_argument('--cost', type=float, default=0.0, help="Coût par rotation (0.001 = 10 pb)")
+    sweep = subparsers.add_parser('sweep', parents=[common],
+                                  help="Recherche en grille des fenêtres de moyennes mobiles (portefeuille équipondéré)")
+    sweep.add_argument('--short', type=int, nargs=3, default=[5, 60, 5], metavar=('DEBUT', 'FIN', 'PAS'),
+                       help="Fenêtres courtes testées, range(DEBUT, FIN, PAS)")
+    sweep.add_argument('--long', type=int, nargs=3, default=[20, 210, 10], metavar=('DEBUT', 'FIN', 'PAS'),
+                       help="Fenêtres longues testées, range(DEBUT, FIN, PAS)")
+    sweep.add_argument('--years', type=int, default=10, help="Années d'historique")
+    sweep.add_argument('--cost', type=float, default=0.0, help="Coût par rotation (0.001 = 10 pb)")
+    sweep.add_argument('--top', type=int, default=10, help="Nombre de couples affichés (0 pour tous)")
+    export = subparsers.add_parser('export', help="Export de la Google Sheet (CSV, CSV gzip, Parquet)")
+    export.add_argument('--sheet-id', required=True, help="ID de la Google Sheet")
+    export.add_argument('--credentials', default='credentials.json', help="Fichier credentials Google")
+    export.add_argument('--output', '-o', default='trading_analysis.csv',
+                        help="Fichier de sortie (.csv, .csv.gz ou .parquet)")
+    export.add_argument('--incremental', action='store_true',
+                        help="N'ajoute que les lignes écrites depuis le dernier export")
+    export.add_argument('--page-size', type=int, default=1000, help="Lignes lues par requête")
+    return parser
+
+def run_cli(argv=None):
+    """Point d'entrée non interactif. Retourne le code de sortie."""
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+
+    if args.command == 'export':
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                return cmd_export(args)
+            except Exception as e:
+                print(f"❌ Erreur export: {e}")
+                return EXIT_FAILURE
+
+    if args.jobs < 1:
+        print("❌ --jobs doit être supérieur ou égal à 1", file=sys.stderr)
+        return EXIT_USAGE
+
+    targets, unknown = resolve_targets(args.portfolio, _split_symbols(args.symbols))
+    if unknown:
+        print(f"⚠️  Symboles absents des portefeuilles choisis: {', '.join(unknown)}", file=sys.stderr)
+    if not targets:
+        print("❌ Aucun symbole à analyser", file=sys.stderr)
+        return EXIT_USAGE
+
+    sheets = None
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            provider = _get_provider(args, targets)
+            sheets = _open_sheets(args)
+            with metrics.span(f"cli.{args.command}"):
+                rows, failed, report = COMMANDS[args.command](args, targets, provider, sheets)
+        except Exception as e:
+            print(f"❌ Erreur: {e}")
+            return EXIT_FAILURE
+        finally:
+            if sheets is not None:
+                sheets.shutdown()
+            export_run_report(args.metrics)
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            _write_results(rows, args.format, out, report)
+        print(f"✅ Résultats écrits dans {args.output}", file=sys.stderr)
+    else:
+        _write_results(rows, args.format, sys.stdout, report)
+
+    failed = sorted(set(failed) | set(unknown))
+    if failed:
+        print(f"⚠️  Échec pour: {', '.join(failed)}", file=sys.stderr)
+    return EXIT_FAILURE if failed or not rows else EXIT_OK
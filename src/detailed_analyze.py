@@ -3,16 +3,24 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'stocks'))
 
 from stocks.portfolio import PERSO
-from stocks.get_data import get_stock_data
+from stocks.providers import YFinanceProvider
+from metrics import metrics
 from .calculate_signals import calculate_signals
+from .indicators import format_indicator, sheet_indicator_fields
+from .rolling_stats import HISTORY_BARS, horizon_stats, print_horizon_table
 
-def analyze_detailed(symbol, sheets_manager=None):
-    if symbol not in PERSO:
+def analyze_detailed(symbol, sheets_manager=None, provider=None, portfolio=None, stats=None):
+    """
+    Analyse détaillée d'un symbole. `stats` permet de fournir des statistiques
+    multi-horizons déjà calculées en lot (horizon_stats_batch).
+    """
+    portfolio = portfolio or PERSO
+    if symbol not in portfolio:
         print(f"❌ '{symbol}' n'existe pas dans notre portefeuille")
-        print("📋 Symboles disponibles:", ", ".join(PERSO.keys()))
-        return
+        print("📋 Symboles disponibles:", ", ".join(portfolio.keys()))
+        return None
     
-    company_name = PERSO[symbol]
+    company_name = portfolio[symbol]
     
     print(f"🔍 ANALYSE DÉTAILLÉE - {symbol}")
     print("=" * 80)
@@ -20,16 +28,17 @@ def analyze_detailed(symbol, sheets_manager=None):
     print("=" * 80)
     
     print("📥 Récupération des données...")
-    data = get_stock_data(symbol, days=252)
+    provider = provider or YFinanceProvider()
+    data = provider.get_stock_data(symbol, days=HISTORY_BARS)
     
     if data is None:
         print("❌ Impossible de récupérer les données")
-        return
+        return None
     
     analysis = calculate_signals(data)
     if analysis is None:
         print("❌ Pas assez de données pour l'analyse")
-        return
+        return None
 
     current_price = analysis['price']
     decision = analysis['decision']
@@ -39,10 +48,13 @@ def analyze_detailed(symbol, sheets_manager=None):
     print(f"💰 PRIX ACTUEL: ${current_price:.2f}")
     print(f"📊 VOLUME: {data['Volume'].iloc[-1]:,.0f}")
     
-    high_52w = data['High'].rolling(window=252).max().iloc[-1]
-    low_52w = data['Low'].rolling(window=252).min().iloc[-1]
-    change_1d = ((current_price - data['Close'].iloc[-2]) / data['Close'].iloc[-2]) * 100
-    change_5d = ((current_price - data['Close'].iloc[-6]) / data['Close'].iloc[-6]) * 100 if len(data) > 5 else 0
+    if stats is None:
+        with metrics.span('detailed.horizon_stats'):
+            stats = horizon_stats(data)
+    high_52w = stats['high_252']
+    low_52w = stats['low_252']
+    change_1d = stats['return_1'] * 100
+    change_5d = stats['return_5'] * 100 if len(data) > 5 else 0
     
     print(f"📈 Plus haut 52 semaines: ${high_52w:.2f}")
     print(f"📉 Plus bas 52 semaines: ${low_52w:.2f}")
@@ -73,30 +85,61 @@ def analyze_detailed(symbol, sheets_manager=None):
         print("   • Signaux mixtes ou neutres")
         print("   • Surveiller l'évolution avant de prendre position")
     
-    # Niveaux de support et résistance basiques
-    recent_data = data.tail(20)
-    support = recent_data['Low'].min()
-    resistance = recent_data['High'].max()
+    # Niveaux de support et résistance basiques (20 dernières séances)
+    support = stats['low_20']
+    resistance = stats['high_20']
     
     print(f"\n📊 NIVEAUX TECHNIQUES:")
     print(f"   🔻 Support: ${support:.2f}")
     print(f"   🔺 Résistance: ${resistance:.2f}")
+    print_horizon_table(stats)
+    
+    print(f"\n📐 INDICATEURS:")
+    print(f"   RSI (14): {format_indicator(analysis['rsi'], 1)}")
+    print(f"   MACD (12/26/9): {format_indicator(analysis['macd'], 3)} "
+          f"(signal {format_indicator(analysis['macd_signal'], 3)}, histogramme {format_indicator(analysis['macd_hist'], 3)})")
+    print(f"   Bollinger (20, 2σ): ${format_indicator(analysis['bb_lower'])} - ${format_indicator(analysis['bb_upper'])}")
     
     if sheets_manager:
         try:
             analysis_data = {
                 'company': company_name,
                 'price': f"{current_price:.2f}",
-                'rsi': 'N/A',
-                'macd': 'N/A',
+                **sheet_indicator_fields(analysis),
                 'signal': ', '.join(signals),
                 'recommendation': decision,
                 'volume': f"{data['Volume'].iloc[-1]:.0f}",
                 'change_percent': f"{change_1d:.2f}%"
             }
-            sheets_manager.append_analysis(symbol, analysis_data, analysis_type="Detailed")
-            print(f"\n✅ Analyse sauvegardée dans Google Sheets")
+            saved = sheets_manager.append_analysis(symbol, analysis_data, analysis_type="Detailed")
+            if not saved:
+                print(f"\n⚠️  Échec Google Sheets pour: {symbol}")
+            elif hasattr(sheets_manager, 'has_export_queue') and sheets_manager.has_export_queue():
+                print(f"\n📤 Analyse en cours d'envoi vers Google Sheets (arrière-plan)")
+            else:
+                print(f"\n✅ Analyse sauvegardée dans Google Sheets")
         except Exception as e:
             print(f"\n⚠️  Erreur Google Sheets: {e}")
     
     print("\n" + "=" * 80)
+    
+    return {
+        'symbol': symbol,
+        'company': company_name,
+        'price': current_price,
+        'volume': data['Volume'].iloc[-1],
+        'high_52w': high_52w,
+        'low_52w': low_52w,
+        'change_1d': change_1d,
+        'change_5d': change_5d,
+        'support': support,
+        'resistance': resistance,
+        'signals': signals,
+        'signal_count': signal_count,
+        'decision': decision,
+        'rsi': analysis['rsi'],
+        'macd': analysis['macd'],
+        'macd_signal': analysis['macd_signal'],
+        'bb_upper': analysis['bb_upper'],
+        'bb_lower': analysis['bb_lower']
+    }
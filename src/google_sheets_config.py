@@ -99,6 +99,10 @@ def configure_google_sheets(sheets_manager):
             if success:
                 print("✅ Configuration Google Sheets terminée!")
                 
+                # Envoyer les analyses en arrière-plan pour ne pas ralentir les scans
+                if hasattr(sheets_manager, 'start_export_queue'):
+                    sheets_manager.start_export_queue()
+                
                 # Afficher les infos de la sheet
                 if hasattr(sheets_manager, 'print_status'):
                     sheets_manager.print_status()
@@ -159,6 +163,23 @@ def setup_google_sheets_integration(modules):
         print("\n📝 Fonctionnement sans Google Sheets")
         return None
 
+def shutdown_google_sheets(sheets_manager, timeout=60):
+    """Vide la file d'envoi Google Sheets avant la fermeture de l'application."""
+    if not sheets_manager or not hasattr(sheets_manager, 'shutdown'):
+        return True
+    
+    pending = sheets_manager.pending_exports() if hasattr(sheets_manager, 'pending_exports') else 0
+    if pending:
+        print(f"📤 Envoi des {pending} analyse(s) en attente vers Google Sheets...")
+    try:
+        drained = sheets_manager.shutdown(timeout)
+    except KeyboardInterrupt:
+        print("⚠️  Envoi interrompu, des analyses peuvent ne pas être sauvegardées")
+        return False
+    if not drained:
+        print("⚠️  Délai dépassé, des analyses peuvent ne pas être sauvegardées")
+    return drained
+
 def create_sample_sheet_guide():
     """Affiche un guide pour créer une Google Sheet."""
     print("\n📖 GUIDE: Créer une Google Sheet pour le Trading Agent")
@@ -0,0 +1,95 @@
+"""
+Moyennes mobiles incrémentales pour la réévaluation fréquente des signaux.
+
+Chaque symbole garde ses propres tampons circulaires: une nouvelle barre
+ou un nouveau tick met à jour MA20/MA50 et les signaux en O(1), sans
+recalculer les moyennes mobiles sur tout l'historique.
+"""
+
+from .calculate_signals import evaluate_signals
+
+
+class RollingWindow:
+    """Tampon circulaire de taille fixe avec somme courante."""
+
+    def __init__(self, size):
+        self.size = size
+        self._buffer = [0.0] * size
+        self._index = 0
+        self.count = 0
+        self._total = 0.0
+
+    def push(self, value):
+        value = float(value)
+        if self.count == self.size:
+            self._total -= self._buffer[self._index]
+        else:
+            self.count += 1
+        self._buffer[self._index] = value
+        self._total += value
+        self._index = (self._index + 1) % self.size
+        if self._index == 0:
+            # Recalage périodique pour éviter la dérive des arrondis
+            self._total = sum(self._buffer[:self.count])
+
+    def replace_last(self, value):
+        """Remplace la dernière valeur poussée (barre en cours de formation)."""
+        if self.count == 0:
+            self.push(value)
+            return
+        value = float(value)
+        last = (self._index - 1) % self.size
+        self._total += value - self._buffer[last]
+        self._buffer[last] = value
+
+    @property
+    def is_full(self):
+        return self.count == self.size
+
+    def mean(self):
+        if not self.is_full:
+            return None
+        return self._total / self.size
+
+
+class IncrementalSignals:
+    """État incrémental MA20/MA50 et signaux pour un symbole."""
+
+    def __init__(self, symbol, short_window=20, long_window=50):
+        self.symbol = symbol
+        self.short = RollingWindow(short_window)
+        self.long = RollingWindow(long_window)
+        self.last_price = None
+        self.bar_count = 0
+
+    @classmethod
+    def from_history(cls, symbol, data, short_window=20, long_window=50):
+        """Initialise l'état à partir d'un DataFrame historique (colonne Close)."""
+        state = cls(symbol, short_window, long_window)
+        if data is not None and len(data) > 0:
+            closes = data['Close'].dropna().to_numpy()
+            for price in closes[-long_window:]:
+                state.add_bar(price)
+            state.bar_count = len(closes)
+        return state
+
+    def add_bar(self, price):
+        """Ajoute une barre clôturée."""
+        self.short.push(price)
+        self.long.push(price)
+        self.last_price = float(price)
+        self.bar_count += 1
+        return self.current()
+
+    def update_tick(self, price):
+        """Met à jour la barre en cours avec un prix intrajournalier."""
+        self.short.replace_last(price)
+        self.long.replace_last(price)
+        self.last_price = float(price)
+        return self.current()
+
+    def current(self):
+        """Retourne l'analyse courante au même format que calculate_signals."""
+        if self.last_price is None or self.bar_count < self.short.size:
+            return None
+        return evaluate_signals(self.last_price, self.short.mean(), self.long.mean())
@@ -0,0 +1,161 @@
+"""
+Indicateurs techniques en une seule passe: RSI, MACD (ligne, signal,
+histogramme), EMA et bandes de Bollinger.
+
+Tous les indicateurs sont mis à jour ensemble dans une même boucle sur les
+dates, vectorisée sur les symboles: une matrice (dates x symboles) coûte
+autant de pas qu'un seul symbole, et ajouter un indicateur n'ajoute pas de
+passe pandas par symbole.
+"""
+
+import numpy as np
+import pandas as pd
+
+INDICATOR_COLUMNS = [
+    'rsi', 'macd', 'macd_signal', 'macd_hist', 'ema_fast', 'ema_slow',
+    'bb_middle', 'bb_upper', 'bb_lower'
+]
+
+def _align_to_last_row(values):
+    """
+    Décale les valeurs de chaque colonne vers le bas pour que la dernière
+    observation valide de chaque symbole se trouve sur la dernière ligne.
+    Les symboles cotés sur des calendriers différents sont ainsi traités
+    comme leur propre série, comme dans calculate_signals.
+    """
+    order = np.argsort(~np.isnan(values), axis=0, kind='stable')
+    return np.take_along_axis(values, order, axis=0)
+
+def _panel_state(values, rsi_period, fast, slow, signal, bb_window):
+    """
+    Boucle unique sur les dates d'une matrice (dates x symboles), vectorisée
+    sur les symboles; les valeurs manquantes sont en tête de colonne.
+    """
+    n_symbols = values.shape[1]
+    alpha_fast = 2 / (fast + 1)
+    alpha_slow = 2 / (slow + 1)
+    alpha_signal = 2 / (signal + 1)
+    alpha_rsi = 1 / rsi_period
+
+    ema_fast = np.full(n_symbols, np.nan)
+    ema_slow = np.full(n_symbols, np.nan)
+    macd_signal = np.full(n_symbols, np.nan)
+    avg_gain = np.zeros(n_symbols)
+    avg_loss = np.zeros(n_symbols)
+    window_sum = np.zeros(n_symbols)
+    window_sumsq = np.zeros(n_symbols)
+    previous = np.full(n_symbols, np.nan)
+    count = np.zeros(n_symbols, dtype=int)
+
+    for t in range(values.shape[0]):
+        price = values[t]
+        valid = ~np.isnan(price)
+        first = valid & (count == 0)
+        later = valid & (count > 0)
+        count += valid
+
+        # EMA (adjust=False): initialisées sur la première valeur
+        ema_fast = np.where(first, price, np.where(later, ema_fast + alpha_fast * (price - ema_fast), ema_fast))
+        ema_slow = np.where(first, price, np.where(later, ema_slow + alpha_slow * (price - ema_slow), ema_slow))
+        macd = ema_fast - ema_slow
+        macd_signal = np.where(first, macd, np.where(later, macd_signal + alpha_signal * (macd - macd_signal), macd_signal))
+
+        # RSI de Wilder sur les variations
+        change = np.where(later, price - previous, 0.0)
+        avg_gain = np.where(later, avg_gain + alpha_rsi * (np.maximum(change, 0.0) - avg_gain), avg_gain)
+        avg_loss = np.where(later, avg_loss + alpha_rsi * (np.maximum(-change, 0.0) - avg_loss), avg_loss)
+        previous = np.where(valid, price, previous)
+
+        # Bollinger: sommes glissantes du prix et de son carré
+        window_sum += np.where(valid, price, 0.0)
+        window_sumsq += np.where(valid, price * price, 0.0)
+        if t >= bb_window:
+            leaving = values[t - bb_window]
+            window_sum -= np.where(np.isnan(leaving), 0.0, leaving)
+            window_sumsq -= np.where(np.isnan(leaving), 0.0, leaving * leaving)
+
+    return ema_fast, ema_slow, macd_signal, avg_gain, avg_loss, window_sum, window_sumsq, count
+
+def _series_state(closes, rsi_period, fast, slow, signal, bb_window):
+    """Même boucle sur des flottants Python: plus rapide que NumPy pour un seul symbole."""
+    alpha_fast = 2 / (fast + 1)
+    alpha_slow = 2 / (slow + 1)
+    alpha_signal = 2 / (signal + 1)
+    alpha_rsi = 1 / rsi_period
+
+    ema_fast = ema_slow = closes[0]
+    macd_signal = 0.0
+    avg_gain = avg_loss = 0.0
+    for previous, price in zip(closes, closes[1:]):
+        ema_fast += alpha_fast * (price - ema_fast)
+        ema_slow += alpha_slow * (price - ema_slow)
+        macd_signal += alpha_signal * (ema_fast - ema_slow - macd_signal)
+        change = price - previous
+        avg_gain += alpha_rsi * (max(change, 0.0) - avg_gain)
+        avg_loss += alpha_rsi * (max(-change, 0.0) - avg_loss)
+
+    window = closes[-bb_window:]
+    state = (ema_fast, ema_slow, macd_signal, avg_gain, avg_loss, sum(window), sum(x * x for x in window))
+    return tuple(np.array([value]) for value in state) + (np.array([len(closes)]),)
+
+def _finalize(state, rsi_period, fast, slow, signal, bb_window, bb_width):
+    """Dernières valeurs des indicateurs à partir de l'état de fin de boucle."""
+    ema_fast, ema_slow, macd_signal, avg_gain, avg_loss, window_sum, window_sumsq, count = state
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0),
+                       100 - 100 / (1 + avg_gain / avg_loss))
+        bb_middle = window_sum / bb_window
+        bb_std = np.sqrt(np.maximum(window_sumsq / bb_window - bb_middle ** 2, 0.0))
+
+    has_macd = count >= slow
+    has_bands = count >= bb_window
+    macd = np.where(has_macd, ema_fast - ema_slow, np.nan)
+    macd_signal = np.where(count >= slow + signal - 1, macd_signal, np.nan)
+    return {
+        'rsi': np.where(count > rsi_period, rsi, np.nan),
+        'macd': macd,
+        'macd_signal': macd_signal,
+        'macd_hist': macd - macd_signal,
+        'ema_fast': np.where(count >= fast, ema_fast, np.nan),
+        'ema_slow': np.where(has_macd, ema_slow, np.nan),
+        'bb_middle': np.where(has_bands, bb_middle, np.nan),
+        'bb_upper': np.where(has_bands, bb_middle + bb_width * bb_std, np.nan),
+        'bb_lower': np.where(has_bands, bb_middle - bb_width * bb_std, np.nan)
+    }
+
+def compute_indicators(prices, rsi_period=14, fast=12, slow=26, signal=9, bb_window=20, bb_width=2.0,
+                       aligned=False):
+    """
+    Dernières valeurs des indicateurs pour une série de clôtures (dict) ou une
+    matrice de prix dates x symboles (DataFrame indexé par symbole, colonnes
+    INDICATOR_COLUMNS). NaN tant que l'historique est trop court.
+    aligned=True indique une matrice déjà passée par _align_to_last_row.
+    """
+    params = (rsi_period, fast, slow, signal, bb_window)
+    if isinstance(prices, pd.Series):
+        closes = prices.dropna().to_numpy(dtype='float64').tolist()
+        if not closes:
+            return {name: np.nan for name in INDICATOR_COLUMNS}
+        result = _finalize(_series_state(closes, *params), *params, bb_width)
+        return {name: float(column[0]) for name, column in result.items()}
+
+    if prices is None or prices.empty:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS)
+    values = prices.to_numpy(dtype='float64')
+    if not aligned:
+        values = _align_to_last_row(values)
+    result = _finalize(_panel_state(values, *params), *params, bb_width)
+    return pd.DataFrame(result, index=prices.columns)[INDICATOR_COLUMNS]
+
+def format_indicator(value, digits=2):
+    """Valeur formatée pour Google Sheets, 'N/A' si absente."""
+    if value is None or pd.isna(value):
+        return 'N/A'
+    return f"{value:.{digits}f}"
+
+def sheet_indicator_fields(analysis):
+    """Colonnes rsi et macd d'une ligne d'analyse Google Sheets."""
+    return {
+        'rsi': format_indicator(analysis.get('rsi'), 1),
+        'macd': format_indicator(analysis.get('macd'), 3)
+    }
@@ -2,6 +2,8 @@
 Système de menu pour l'application Trading Agent.
 """
 
+ALL_PORTFOLIOS = 'TOUS'
+
 def select_portfolio(modules):
     """Permet à l'utilisateur de sélectionner un portefeuille."""
     portfolios = {
@@ -9,6 +11,12 @@ def select_portfolio(modules):
         '2': ('BIGPHARMA', modules['BIGPHARMA']),
         '3': ('SMALLPHARMA', modules['SMALLPHARMA'])
     }
+    if modules.get('scan_portfolios'):
+        merged = {}
+        for _, portfolio in portfolios.values():
+            for symbol, company in portfolio.items():
+                merged.setdefault(symbol, company)
+        portfolios['4'] = (ALL_PORTFOLIOS, merged)
     
     print("\n" + "=" * 80)
     print("📊 SÉLECTION DU PORTEFEUILLE")
@@ -16,59 +24,88 @@ def select_portfolio(modules):
     print("1. 🏠 PERSO (Portfolio personnel)")
     print("2. 💊 BIGPHARMA (Grandes pharmas)")
     print("3. 🧪 SMALLPHARMA (Petites pharmas)")
+    if '4' in portfolios:
+        print("4. 🌐 TOUS (chaque action analysée une seule fois)")
     print("=" * 50)
     
     while True:
         try:
-            choice = input("\n👉 Choisissez votre portefeuille (1-3): ").strip()
+            choice = input(f"\n👉 Choisissez votre portefeuille (1-{len(portfolios)}): ").strip()
             if choice in portfolios:
                 name, portfolio = portfolios[choice]
                 print(f"✅ Portefeuille sélectionné: {name} ({len(portfolio)} actions)")
                 return name, portfolio
             else:
-                print("❌ Choix invalide. Veuillez entrer 1, 2 ou 3.")
+                print(f"❌ Choix invalide. Veuillez entrer un nombre entre 1 et {len(portfolios)}.")
         except KeyboardInterrupt:
             print("\n\n👋 Au revoir !")
             return None, None
         except Exception as e:
             print(f"❌ Erreur: {e}")
 
-def display_menu():
+def display_menu(cache_stats=None):
     print("\n" + "=" * 80)
     print("🎯 QUE VOULEZ-VOUS FAIRE ?")
     print("=" * 80)
+    if cache_stats and cache_stats['hits'] + cache_stats['misses'] > 0:
+        print(f"💾 Cache mémoire: {cache_stats['hits']} succès / {cache_stats['misses']} échecs "
+              f"({cache_stats['hit_rate']:.0%}) - {cache_stats['size']}/{cache_stats['max_entries']} entrées")
     print("1. 🚀 Analyse rapide (toutes les actions)")
     print("2. 🔍 Analyse détaillée (une action)")
     print("3. 🔄 Changer de portefeuille")
-    print("4. ❌ Quitter")
+    print("4. 👁️  Mode surveillance (changements uniquement)")
+    print("5. ❌ Quitter")
     print("=" * 50)
 
 def get_user_choice():
     
     while True:
         try:
-            choice = input("\n👉 Votre choix (1-4): ").strip()
-            if choice in ['1', '2', '3', '4']:
+            choice = input("\n👉 Votre choix (1-5): ").strip()
+            if choice in ['1', '2', '3', '4', '5']:
                 return choice
             else:
-                print("❌ Choix invalide. Veuillez entrer 1, 2, 3 ou 4.")
+                print("❌ Choix invalide. Veuillez entrer 1, 2, 3, 4 ou 5.")
         except KeyboardInterrupt:
             print("\n\n👋 Au revoir !")
-            return '4'  # Traiter Ctrl+C comme quitter
+            return '5'  # Traiter Ctrl+C comme quitter
         except Exception as e:
             print(f"❌ Erreur: {e}")
-            print("💡 Veuillez entrer un nombre entre 1 et 4.")
+            print("💡 Veuillez entrer un nombre entre 1 et 5.")
 
-def handle_quick_analysis(analyze_quick, portfolio_name, portfolio, sheets_manager):
+def handle_quick_analysis(analyze_quick, portfolio_name, portfolio, sheets_manager, provider=None):
     
     print(f"\n🚀 Démarrage de l'analyse rapide pour {portfolio_name}...")
     try:
-        analyze_quick(portfolio_name, portfolio, sheets_manager)
+        analyze_quick(portfolio_name, portfolio, sheets_manager, provider=provider)
+        print("✅ Analyse rapide terminée!")
+    except Exception as e:
+        print(f"❌ Erreur lors de l'analyse rapide: {e}")
+
+def handle_scan_all(scan_portfolios, modules, sheets_manager, provider=None):
+    
+    portfolios = {name: modules[name] for name in ('PERSO', 'BIGPHARMA', 'SMALLPHARMA')}
+    print(f"\n🚀 Démarrage de l'analyse rapide de tous les portefeuilles...")
+    try:
+        scan_portfolios(portfolios, sheets_manager, provider=provider)
         print("✅ Analyse rapide terminée!")
     except Exception as e:
         print(f"❌ Erreur lors de l'analyse rapide: {e}")
 
-def handle_detailed_analysis(analyze_detailed, portfolio_name, portfolio, sheets_manager):
+def handle_watch(watch_portfolio, portfolio_name, portfolio, sheets_manager, provider=None):
+    
+    answer = input("\n👉 Intervalle entre deux cycles en secondes (60 par défaut): ").strip()
+    try:
+        interval = max(5, int(answer)) if answer else 60
+    except ValueError:
+        print("⚠️  Intervalle invalide, utilisation de 60s")
+        interval = 60
+    try:
+        watch_portfolio(portfolio_name, portfolio, sheets_manager, provider=provider, interval=interval)
+    except Exception as e:
+        print(f"❌ Erreur en mode surveillance: {e}")
+
+def handle_detailed_analysis(analyze_detailed, portfolio_name, portfolio, sheets_manager, provider=None):
     
     print(f"\n🔍 Analyse détaillée - {portfolio_name}")
     print("=" * 80)
@@ -83,7 +120,7 @@ def handle_detailed_analysis(analyze_detailed, portfolio_name, portfolio, sheets
         if symbol in portfolio:
             print(f"\n🔍 Analyse détaillée de {symbol} ({portfolio[symbol]})...")
             try:
-                analyze_detailed(symbol, sheets_manager)
+                analyze_detailed(symbol, sheets_manager, provider=provider, portfolio=portfolio)
                 print("✅ Analyse détaillée terminée!")
                 break
             except Exception as e:
@@ -98,11 +135,13 @@ def handle_detailed_analysis(analyze_detailed, portfolio_name, portfolio, sheets
             if retry != 'y':
                 break
 
-def run_main_menu(modules, sheets_manager):
+def run_main_menu(modules, sheets_manager, provider=None):
     
     print("\n🎯 Application prête à utiliser!")
+    provider = provider or modules.get('data_provider')
     analyze_quick = modules['analyze_quick']
     analyze_detailed = modules['analyze_detailed']
+    get_cache_stats = modules.get('get_cache_stats')
     
     # Sélection initiale du portefeuille
     portfolio_name, portfolio = select_portfolio(modules)
@@ -110,21 +149,25 @@ def run_main_menu(modules, sheets_manager):
         return
     
     while True:
-        display_menu()
+        display_menu(get_cache_stats() if get_cache_stats else None)
         choice = get_user_choice()
-        if choice == '1':
-            handle_quick_analysis(analyze_quick, portfolio_name, portfolio, sheets_manager)
+        if choice == '1' and portfolio_name == ALL_PORTFOLIOS:
+            handle_scan_all(modules['scan_portfolios'], modules, sheets_manager, provider)
+        elif choice == '1':
+            handle_quick_analysis(analyze_quick, portfolio_name, portfolio, sheets_manager, provider)
         elif choice == '2':
-            handle_detailed_analysis(analyze_detailed, portfolio_name, portfolio, sheets_manager)
+            handle_detailed_analysis(analyze_detailed, portfolio_name, portfolio, sheets_manager, provider)
         elif choice == '3':
             portfolio_name, portfolio = select_portfolio(modules)
             if portfolio is None:
                 break
             continue
         elif choice == '4':
+            handle_watch(modules['watch_portfolio'], portfolio_name, portfolio, sheets_manager, provider)
+        elif choice == '5':
             print("\n👋 Au revoir !")
             break
-        if choice in ['1', '2']:
+        if choice in ['1', '2', '4']:
             print("\n" + "-" * 80)
             continue_choice = input("🔄 Voulez-vous faire autre chose? (y/n): ").strip().lower()
             if continue_choice != 'y':
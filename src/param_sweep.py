@@ -0,0 +1,194 @@
+"""
+Recherche en grille des fenêtres de moyennes mobiles (courte, longue).
+
+Les prix et leurs sommes cumulées sont placés une seule fois en mémoire
+partagée: les processus du pool s'y attachent sans que l'historique soit
+sérialisé pour chaque tâche, et chaque moyenne mobile coûte O(n) quelle
+que soit la taille de la fenêtre.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from metrics import metrics
+from .backtest import TRADING_DAYS, on_own_calendar
+
+# En dessous (barres x symboles x couples), le démarrage du pool coûte plus
+# qu'il ne rapporte: ~1.5 s de calcul séquentiel
+MIN_PARALLEL_CELLS = 10_000_000
+
+_SHARED = {}
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def pool_size(cells, processes=None):
+    """Processus à utiliser: jamais plus que de CPU disponibles, un seul pour les petites grilles."""
+    if cells < MIN_PARALLEL_CELLS:
+        return 1
+    return max(1, min(processes or available_cpus(), available_cpus()))
+
+def _to_shared(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[:] = array
+    return shm
+
+def _attach(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _init_worker(specs):
+    """Attache les tableaux partagés dans le processus du pool (lecture seule)."""
+    for key, (name, shape, dtype) in specs.items():
+        shm, array = _attach(name, shape, dtype)
+        array.flags.writeable = False
+        _SHARED[key] = array
+        _SHARED[f"_{key}_shm"] = shm
+
+def _moving_average(window):
+    """
+    MA à partir des sommes cumulées partagées, calculées sur les barres
+    cotées de chaque symbole (matrice 'aligned'); NaN tant que l'historique
+    est plus court que la fenêtre.
+    """
+    cumsum, cumcount = _SHARED['cumsum'], _SHARED['cumcount']
+    total = cumsum[window:] - cumsum[:-window]
+    count = cumcount[window:] - cumcount[:-window]
+    ma = np.full(_SHARED['prices'].shape, np.nan)
+    ma[window - 1:] = np.where(count == window, total / window, np.nan)
+    return ma
+
+def _forward_fill(targets):
+    """Équivalent NumPy de DataFrame.ffill() le long des dates."""
+    valid = ~np.isnan(targets)
+    index = np.where(valid, np.arange(len(targets))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    return np.take_along_axis(targets, index, axis=0)
+
+def _evaluate_pair(short, long, cost):
+    prices, aligned = _SHARED['prices'], _SHARED['aligned']
+    ma_short = _moving_average(short)
+    ma_long = _moving_average(long)
+
+    with np.errstate(invalid='ignore'):
+        aligned_counts = np.where(
+            np.isnan(ma_short), np.nan,
+            (aligned > ma_short).astype(int)
+            + (aligned > ma_long).astype(int)
+            + (ma_short > ma_long).astype(int)
+        )
+    # Retour des signaux à leurs dates (NaN les jours sans cotation), comme backtest.on_own_calendar
+    counts = np.empty_like(aligned_counts)
+    np.put_along_axis(counts, _SHARED['order'], aligned_counts, axis=0)
+    has_signal = ~np.isnan(counts)
+    targets = np.full(prices.shape, np.nan)
+    targets[has_signal & (counts == 3)] = 1.0
+    targets[has_signal & (counts == 0)] = 0.0
+    positions = np.nan_to_num(_forward_fill(targets), nan=0.0)
+
+    held = np.vstack([np.zeros((1, prices.shape[1])), positions[:-1]])
+    turnover = np.abs(np.diff(positions, axis=0, prepend=0.0))
+    asset_returns = _SHARED['asset_returns']
+    strategy = held * np.nan_to_num(asset_returns) - cost * turnover
+    strategy[np.isnan(prices)] = np.nan
+
+    with np.errstate(invalid='ignore'):
+        portfolio = np.nanmean(np.where(np.isnan(prices), np.nan, strategy), axis=1)
+    # Mêmes conventions que backtest._summarize: dates sans aucune cotation ignorées,
+    # durée et rotation rapportées aux barres cotées de chaque symbole
+    portfolio = portfolio[~np.isnan(portfolio)]
+    symbol_years = np.count_nonzero(~np.isnan(prices), axis=0) / TRADING_DAYS
+
+    years = len(portfolio) / TRADING_DAYS
+    equity = np.cumprod(1 + portfolio)
+    total_return = equity[-1] - 1
+    volatility = portfolio.std(ddof=1) * np.sqrt(TRADING_DAYS)
+    return {
+        'short': short,
+        'long': long,
+        'total_return': total_return,
+        'cagr': (1 + total_return) ** (1 / years) - 1 if years else np.nan,
+        'volatility': volatility,
+        'sharpe': portfolio.mean() * TRADING_DAYS / volatility if volatility else np.nan,
+        'max_drawdown': (equity / np.maximum.accumulate(equity) - 1).min(),
+        'turnover': np.mean(turnover.sum(axis=0) / np.where(symbol_years > 0, symbol_years, np.nan))
+    }
+
+def _evaluate_chunk(pairs, cost):
+    return [_evaluate_pair(short, long, cost) for short, long in pairs]
+
+def build_window_grid(shorts, longs):
+    """Couples (courte, longue) valides, avec courte < longue."""
+    return [(short, long) for short, long in product(shorts, longs) if short < long]
+
+@metrics.timed('sweep.run')
+def run_sweep(prices, pairs, cost=0.0, processes=None, chunk_size=None):
+    """
+    Évalue chaque couple de fenêtres sur la matrice de prix (dates x symboles),
+    en portefeuille équipondéré. Retourne un DataFrame classé par Sharpe décroissant.
+    `processes` est un maximum, voir pool_size.
+    """
+    prices = prices.sort_index()
+    values = np.ascontiguousarray(prices.to_numpy(dtype='float64'))
+    # Barres cotées de chaque symbole regroupées en bas de colonne: un jour
+    # férié d'une place ne vide pas les moyennes mobiles de ses symboles
+    order = np.argsort(~np.isnan(values), axis=0, kind='stable')
+    aligned = np.take_along_axis(values, order, axis=0)
+    valid = ~np.isnan(aligned)
+
+    arrays = {
+        'prices': values,
+        'aligned': aligned,
+        'order': order,
+        'cumsum': np.vstack([np.zeros((1, values.shape[1])), np.cumsum(np.where(valid, aligned, 0.0), axis=0)]),
+        'cumcount': np.vstack([np.zeros((1, values.shape[1])), np.cumsum(valid, axis=0)]).astype('float64'),
+        'asset_returns': np.ascontiguousarray(
+            on_own_calendar(prices, lambda frame: frame.pct_change(fill_method=None)).to_numpy(dtype='float64')
+        )
+    }
+
+    processes = pool_size(values.size * len(pairs), processes)
+    chunk_size = chunk_size or max(1, len(pairs) // (processes * 4))
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+    segments = {key: _to_shared(array) for key, array in arrays.items()}
+    specs = {key: (segments[key].name, array.shape, array.dtype.str) for key, array in arrays.items()}
+    metrics.incr('sweep.pairs', len(pairs))
+    try:
+        if processes == 1:
+            _init_worker(specs)
+            rows = [row for chunk in chunks for row in _evaluate_chunk(chunk, cost)]
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(specs,)) as pool:
+                futures = [pool.submit(_evaluate_chunk, chunk, cost) for chunk in chunks]
+                rows = [row for future in futures for row in future.result()]
+    finally:
+        for key in list(_SHARED):
+            if key.endswith('_shm'):
+                _SHARED.pop(key).close()
+        _SHARED.clear()
+        for shm in segments.values():
+            shm.close()
+            shm.unlink()
+
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    return table.sort_values('sharpe', ascending=False, na_position='last').reset_index(drop=True)
+
+def print_sweep_report(table, top=10):
+    print(f"\n🔧 MEILLEURES FENÊTRES ({len(table)} couples testés)")
+    print("=" * 80)
+    print(f"{'Rang':<5} | {'Courte':>6} | {'Longue':>6} | {'Rendement':>10} | {'CAGR':>7} | {'Sharpe':>6} | {'Max DD':>8}")
+    print("-" * 80)
+    for rank, row in enumerate(table.head(top).itertuples(), 1):
+        print(f"{rank:<5} | {row.short:>6} | {row.long:>6} | {row.total_return:>+10.1%} | "
+              f"{row.cagr:>+7.1%} | {row.sharpe:>6.2f} | {row.max_drawdown:>8.1%}")
@@ -1,49 +1,67 @@
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'stocks'))
+from concurrent.futures import Future
 
-from stocks.get_data import get_stock_data
+from stocks.get_data import DEFAULT_MAX_WORKERS, DEFAULT_FETCH_TIMEOUT
+from stocks.providers import YFinanceProvider
+from metrics import metrics
 from .calculate_signals import calculate_signals
+from .indicators import sheet_indicator_fields
 
-def analyze_quick(portfolio_name, portfolio, sheets_manager=None):
-    print(f"🚀 ANALYSE RAPIDE - {portfolio_name}")
-    print("=" * 80)
-    
-    results = []
-    
-    for symbol, name in portfolio.items():
-        print(f"📊 Analyse de {symbol}...")
-        
-        data = get_stock_data(symbol)
-        analysis = calculate_signals(data)
-        if analysis: 
-            change_1d = 0
-            if len(data) > 1:
-                change_1d = ((analysis['price'] - data['Close'].iloc[-2]) / data['Close'].iloc[-2]) * 100
-            result = {
-                'Symbol': symbol,
-                'Name': name,
-                'Price': analysis['price'],
-                'Decision': analysis['decision'],
-                'Signals': f"{analysis['signal_count']}/3",
-                'Change': change_1d
-            }
-            results.append(result)
-            if sheets_manager:
-                try:
-                    analysis_data = {
-                        'company': name,
-                        'price': f"{analysis['price']:.2f}",
-                        'rsi': 'N/A',
-                        'macd': 'N/A',
-                        'signal': ', '.join(analysis['signals']),
-                        'recommendation': analysis['decision'],
-                        'volume': f"{data['Volume'].iloc[-1]:.0f}" if len(data) > 0 else 'N/A',
-                        'change_percent': f"{change_1d:.2f}%"
-                    }
-                    sheets_manager.append_analysis(symbol, analysis_data, analysis_type="Quick")
-                except Exception as e:
-                    print(f"⚠️  Erreur Google Sheets pour {symbol}: {e}")
+def evaluate_symbol(symbol, name, data):
+    """
+    Calcule les signaux d'un symbole. Retourne (résultat, données Google Sheets),
+    ou (None, None) si l'historique ne suffit pas.
+    """
+    analysis = calculate_signals(data)
+    if not analysis:
+        return None, None
+
+    change_1d = 0
+    if len(data) > 1:
+        change_1d = ((analysis['price'] - data['Close'].iloc[-2]) / data['Close'].iloc[-2]) * 100
+    result = {
+        'Symbol': symbol,
+        'Name': name,
+        'Price': analysis['price'],
+        'Decision': analysis['decision'],
+        'Signals': f"{analysis['signal_count']}/3",
+        'SignalList': analysis['signals'],
+        'Change': change_1d,
+        'RSI': analysis['rsi'],
+        'MACD': analysis['macd']
+    }
+    analysis_data = {
+        'company': name,
+        'price': f"{analysis['price']:.2f}",
+        **sheet_indicator_fields(analysis),
+        'signal': ', '.join(analysis['signals']),
+        'recommendation': analysis['decision'],
+        'volume': f"{data['Volume'].iloc[-1]:.0f}" if len(data) > 0 else 'N/A',
+        'change_percent': f"{change_1d:.2f}%"
+    }
+    return result, analysis_data
+
+def open_sheets_batch(sheets_manager):
+    """Regroupe les écritures Google Sheets en un seul envoi par lot si possible."""
+    return bool(sheets_manager) and hasattr(sheets_manager, 'open_batch') \
+        and sheets_manager.open_batch() is not None
+
+def save_to_sheets(sheets_manager, symbol, analysis_data, analysis_type="Quick"):
+    """
+    Retourne le Future de l'envoi si la file d'arrière-plan est active,
+    sinon le booléen de append_analysis.
+    """
+    try:
+        if hasattr(sheets_manager, 'has_export_queue') and sheets_manager.has_export_queue():
+            return sheets_manager.submit_analysis(symbol, analysis_data, analysis_type=analysis_type)
+        return sheets_manager.append_analysis(symbol, analysis_data, analysis_type=analysis_type)
+    except Exception as e:
+        print(f"⚠️  Erreur Google Sheets pour {symbol}: {e}")
+        return False
+
+def print_quick_report(results):
     print("\n📈 RÉSULTATS:")
     print("-" * 80)
     print(f"{'Symbol':<6} | {'Name':<20} | {'Price':<8} | {'Change':<8} | {'Decision':<15} | {'Signals'}")
@@ -66,6 +84,61 @@ def analyze_quick(portfolio_name, portfolio, sheets_manager=None):
     print(f"🔴 À vendre: {sell_count}")
     print(f"🟡 À surveiller: {wait_count}")
     print(f"📈 Variation moyenne: {avg_change:+.2f}%")
-    
-    if sheets_manager:
+
+def print_sheets_status(sheets_manager, sheets_results, queued=None):
+    """
+    sheets_results: {symbole: succès} des lots envoyés; queued: {symbole: Future}
+    des analyses confiées à la file d'arrière-plan.
+    """
+    if queued:
+        failed = [symbol for symbol, future in queued.items() if future.done() and not future.result()]
+        pending = sum(1 for future in queued.values() if not future.done())
+        if failed:
+            print(f"⚠️  Échec Google Sheets pour: {', '.join(failed)}")
+        if pending:
+            print(f"📤 {pending} analyse(s) en cours d'envoi vers Google Sheets (arrière-plan)")
+        elif not failed:
+            print(f"✅ Toutes les analyses sauvegardées dans Google Sheets")
+    elif sheets_results:
+        failed = [symbol for symbol, ok in sheets_results.items() if not ok]
+        if failed:
+            print(f"⚠️  Échec Google Sheets pour: {', '.join(failed)}")
+        else:
+            print(f"✅ Toutes les analyses sauvegardées dans Google Sheets")
+    elif sheets_manager:
         print(f"✅ Toutes les analyses sauvegardées dans Google Sheets")
+
+def analyze_quick(portfolio_name, portfolio, sheets_manager=None,
+                  max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_FETCH_TIMEOUT,
+                  provider=None):
+    print(f"🚀 ANALYSE RAPIDE - {portfolio_name}")
+    print("=" * 80)
+    
+    results = []
+    provider = provider or YFinanceProvider()
+    
+    print(f"📥 Récupération des données ({len(portfolio)} actions, {max_workers} en parallèle)...")
+    with metrics.span('quick.fetch'):
+        fetched = provider.fetch_portfolio_data(portfolio, days=60, max_workers=max_workers, timeout=timeout)
+    
+    batched = open_sheets_batch(sheets_manager)
+    sheets_results = {}
+    queued = {}
+    try:
+        for symbol, data in fetched:
+            print(f"📊 Analyse de {symbol}...")
+            result, analysis_data = evaluate_symbol(symbol, portfolio[symbol], data)
+            if result:
+                results.append(result)
+                if sheets_manager:
+                    outcome = save_to_sheets(sheets_manager, symbol, analysis_data)
+                    if isinstance(outcome, Future):
+                        queued[symbol] = outcome
+    finally:
+        if batched:
+            sheets_results = sheets_manager.close_batch()
+    
+    print_quick_report(results)
+    print_sheets_status(sheets_manager, sheets_results, queued)
+    
+    return results
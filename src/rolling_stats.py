@@ -0,0 +1,85 @@
+"""
+Statistiques multi-horizons (plus haut, plus bas, rendement, amplitude)
+pour un symbole ou un lot de symboles.
+
+Seules les dernières valeurs sont utiles aux rapports: un maximum et un
+minimum cumulés, calculés en remontant le temps depuis la dernière barre,
+donnent en une passe le plus haut et le plus bas de tous les horizons, au
+lieu d'un rolling complet par horizon sur tout l'historique.
+"""
+
+import numpy as np
+import pandas as pd
+
+HORIZONS = (1, 5, 20, 60, 252)
+# Le rendement sur h séances compare la dernière barre à celle d'il y a h séances
+HISTORY_BARS = max(HORIZONS) + 1
+
+def stat_columns(horizons=HORIZONS):
+    return [f"{name}_{h}" for h in horizons for name in ('high', 'low', 'return', 'range')]
+
+def _stacked_tails(frames, rows, fields=('High', 'Low', 'Close')):
+    """
+    Matrices (rows x symboles) des `rows` dernières barres de chaque symbole,
+    alignées sur sa propre dernière barre (NaN en tête si l'historique est court).
+    """
+    arrays = {field: np.full((rows, len(frames)), np.nan) for field in fields}
+    for column, data in enumerate(frames.values()):
+        listed = ~np.isnan(data['Close'].to_numpy(dtype='float64'))
+        for field in fields:
+            values = data[field].to_numpy(dtype='float64')[listed][-rows:]
+            arrays[field][rows - len(values):, column] = values
+    return arrays
+
+def _horizon_arrays(frames, horizons):
+    """Dernières valeurs par horizon, {colonne: tableau par symbole}."""
+    depth = max(horizons)
+    aligned = _stacked_tails(frames, depth + 1)
+
+    # Une passe à rebours: running_high[k] = plus haut des k+1 dernières barres
+    running_high = np.fmax.accumulate(aligned['High'][:0:-1], axis=0)
+    running_low = np.fmin.accumulate(aligned['Low'][:0:-1], axis=0)
+
+    closes = aligned['Close']
+    last = closes[-1]
+    stats = {}
+    for h in horizons:
+        k = h - 1
+        stats[f"high_{h}"] = running_high[k]
+        stats[f"low_{h}"] = running_low[k]
+        previous = closes[-1 - h]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats[f"return_{h}"] = last / previous - 1
+            stats[f"range_{h}"] = (running_high[k] - running_low[k]) / last
+    return stats
+
+def horizon_stats_batch(frames, horizons=HORIZONS):
+    """
+    Statistiques par horizon pour {symbole: DataFrame OHLC}. Retourne un
+    DataFrame indexé par symbole, colonnes high_h, low_h, return_h, range_h.
+
+    Plus haut, plus bas et amplitude portent sur l'historique disponible s'il
+    est plus court que l'horizon; le rendement est NaN dans ce cas. Rendement
+    et amplitude sont des fractions (0.05 = 5 %), l'amplitude étant rapportée
+    au dernier prix.
+    """
+    frames = {symbol: data for symbol, data in frames.items() if data is not None and not data.empty}
+    if not frames:
+        return pd.DataFrame(columns=stat_columns(horizons))
+    return pd.DataFrame(_horizon_arrays(frames, horizons), index=list(frames))[stat_columns(horizons)]
+
+def horizon_stats(data, horizons=HORIZONS):
+    """Statistiques par horizon d'un seul symbole, sous forme de dict (vide si pas de données)."""
+    if data is None or data.empty:
+        return {}
+    stats = _horizon_arrays({'_': data}, horizons)
+    return {key: float(stats[key][0]) for key in stat_columns(horizons)}
+
+def _percent(value):
+    return "n/d" if pd.isna(value) else f"{value:+.1%}"
+
+def print_horizon_table(stats, horizons=HORIZONS):
+    print(f"   {'Horizon':<8} | {'Plus haut':>10} | {'Plus bas':>10} | {'Rendement':>9} | {'Amplitude':>9}")
+    for h in horizons:
+        print(f"   {str(h) + 'j':<8} | ${stats[f'high_{h}']:>9.2f} | ${stats[f'low_{h}']:>9.2f} | "
+              f"{_percent(stats[f'return_{h}']):>9} | {stats[f'range_{h}']:>9.1%}")
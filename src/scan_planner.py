@@ -0,0 +1,90 @@
+"""
+Analyse rapide de plusieurs portefeuilles en une seule passe.
+
+Les portefeuilles se recoupent (INOV et RKT sont dans PERSO et SMALLPHARMA):
+le planificateur réunit les symboles, télécharge et calcule chaque symbole
+une seule fois, puis reconstruit le rapport de chaque portefeuille à partir
+des résultats partagés.
+"""
+
+from concurrent.futures import Future
+
+from stocks.get_data import DEFAULT_MAX_WORKERS, DEFAULT_FETCH_TIMEOUT
+from stocks.providers import YFinanceProvider
+from metrics import metrics
+from .quick_analyze import (
+    evaluate_symbol, open_sheets_batch, save_to_sheets,
+    print_quick_report, print_sheets_status
+)
+
+def plan_scan(portfolios):
+    """
+    Réunit les symboles de plusieurs portefeuilles ({nom: {symbole: société}}).
+
+    Retourne un dict: symbols ({symbole: société}, dans l'ordre de première
+    apparition), members ({symbole: [portefeuilles]}), duplicates (nombre
+    d'analyses évitées).
+    """
+    symbols = {}
+    members = {}
+    for name, portfolio in portfolios.items():
+        for symbol, company in portfolio.items():
+            symbols.setdefault(symbol, company)
+            members.setdefault(symbol, []).append(name)
+    return {
+        'symbols': symbols,
+        'members': members,
+        'duplicates': sum(len(names) - 1 for names in members.values())
+    }
+
+def scan_portfolios(portfolios, sheets_manager=None, max_workers=DEFAULT_MAX_WORKERS,
+                    timeout=DEFAULT_FETCH_TIMEOUT, provider=None):
+    """
+    Analyse rapide de plusieurs portefeuilles. Chaque symbole n'est téléchargé,
+    calculé et sauvegardé dans Google Sheets qu'une fois.
+
+    Retourne {nom de portefeuille: [résultats]}, au format de analyze_quick.
+    """
+    plan = plan_scan(portfolios)
+    symbols = plan['symbols']
+    provider = provider or YFinanceProvider()
+
+    print(f"🚀 ANALYSE RAPIDE - {', '.join(portfolios)}")
+    print("=" * 80)
+    print(f"📥 Récupération des données ({len(symbols)} actions uniques, "
+          f"{plan['duplicates']} doublons évités, {max_workers} en parallèle)...")
+    metrics.incr('scan.duplicates_skipped', plan['duplicates'])
+    with metrics.span('scan.fetch'):
+        fetched = provider.fetch_portfolio_data(symbols, days=60, max_workers=max_workers, timeout=timeout)
+
+    batched = open_sheets_batch(sheets_manager)
+    shared = {}
+    sheets_results = {}
+    queued = {}
+    try:
+        with metrics.span('scan.signals'):
+            for symbol, data in fetched:
+                result, analysis_data = evaluate_symbol(symbol, symbols[symbol], data)
+                if result:
+                    shared[symbol] = result
+                    if sheets_manager:
+                        outcome = save_to_sheets(sheets_manager, symbol, analysis_data)
+                        if isinstance(outcome, Future):
+                            queued[symbol] = outcome
+    finally:
+        if batched:
+            sheets_results = sheets_manager.close_batch()
+
+    reports = {}
+    for name, portfolio in portfolios.items():
+        # Nom de société propre à chaque portefeuille, le reste est partagé
+        reports[name] = [
+            {**shared[symbol], 'Name': company}
+            for symbol, company in portfolio.items() if symbol in shared
+        ]
+        print(f"\n📁 {name} ({len(reports[name])}/{len(portfolio)} actions)")
+        print_quick_report(reports[name])
+
+    print()
+    print_sheets_status(sheets_manager, sheets_results, queued)
+    return reports
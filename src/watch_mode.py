@@ -0,0 +1,164 @@
+"""
+Mode surveillance: réévaluation intrajournalière d'un portefeuille.
+
+L'historique n'est téléchargé qu'une fois; chaque cycle ne demande que le
+dernier prix des symboles dont le marché est ouvert, met à jour les
+moyennes mobiles en O(1) (IncrementalSignals) et n'affiche ou n'exporte
+que les symboles dont la décision ou le nombre de signaux a changé.
+"""
+
+import time
+
+import pandas as pd
+
+from stocks.cache import is_market_open
+from stocks.get_data import DEFAULT_MAX_WORKERS, DEFAULT_FETCH_TIMEOUT
+from stocks.providers import YFinanceProvider
+from metrics import metrics
+from .incremental_signals import IncrementalSignals
+from .quick_analyze import open_sheets_batch, save_to_sheets
+
+DEFAULT_WATCH_INTERVAL = 60
+
+def _bar_date(timestamp):
+    return pd.Timestamp(timestamp).date()
+
+
+class PortfolioWatcher:
+    """État de surveillance d'un portefeuille ({symbole: société})."""
+
+    def __init__(self, portfolio, provider=None, sheets_manager=None,
+                 max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_FETCH_TIMEOUT):
+        self.portfolio = portfolio
+        self.provider = provider or YFinanceProvider()
+        self.sheets_manager = sheets_manager
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.states = {}
+        self.last_bar = {}
+        self.last_seen = {}
+        self.cycles = 0
+        self.polled = 0
+
+    def prime(self):
+        """Charge l'historique une fois et mémorise l'état initial de chaque symbole."""
+        fetched = self.provider.fetch_portfolio_data(
+            self.portfolio, days=60, max_workers=self.max_workers, timeout=self.timeout
+        )
+        for symbol, data in fetched:
+            if data is None or data.empty:
+                continue
+            state = IncrementalSignals.from_history(symbol, data)
+            self.states[symbol] = state
+            self.last_bar[symbol] = _bar_date(data.index[-1])
+            analysis = state.current()
+            if analysis:
+                self.last_seen[symbol] = (analysis['decision'], analysis['signal_count'])
+        return len(self.states)
+
+    def _apply_quote(self, symbol, timestamp, price):
+        state = self.states[symbol]
+        bar = _bar_date(timestamp)
+        if bar > self.last_bar[symbol]:
+            # Première cotation d'une nouvelle séance: nouvelle barre
+            self.last_bar[symbol] = bar
+            return state.add_bar(price)
+        if bar == self.last_bar[symbol]:
+            return state.update_tick(price)
+        return state.current()
+
+    def poll(self, now=None):
+        """
+        Un cycle de surveillance. Retourne la liste des changements
+        (au format des résultats de analyze_quick, avec 'Previous').
+        """
+        self.cycles += 1
+        symbols = [symbol for symbol in self.states if is_market_open(symbol, now)]
+        self.polled = len(symbols)
+        if not symbols:
+            return []
+
+        with metrics.span('watch.quotes'):
+            quotes = self.provider.get_latest_prices(symbols, max_workers=self.max_workers, timeout=self.timeout)
+
+        changes = []
+        for symbol, (timestamp, price) in quotes.items():
+            analysis = self._apply_quote(symbol, timestamp, price)
+            if not analysis:
+                continue
+            key = (analysis['decision'], analysis['signal_count'])
+            previous = self.last_seen.get(symbol)
+            if key == previous:
+                continue
+            self.last_seen[symbol] = key
+            changes.append({
+                'Symbol': symbol,
+                'Name': self.portfolio[symbol],
+                'Price': analysis['price'],
+                'Decision': analysis['decision'],
+                'Signals': f"{analysis['signal_count']}/3",
+                'SignalList': analysis['signals'],
+                'Previous': f"{previous[0]} ({previous[1]}/3)" if previous else None
+            })
+        metrics.incr('watch.changes', len(changes))
+
+        if changes and self.sheets_manager:
+            self._export(changes)
+        return changes
+
+    def _export(self, changes):
+        batched = open_sheets_batch(self.sheets_manager)
+        try:
+            for change in changes:
+                save_to_sheets(self.sheets_manager, change['Symbol'], {
+                    'company': change['Name'],
+                    'price': f"{change['Price']:.2f}",
+                    'rsi': 'N/A',
+                    'macd': 'N/A',
+                    'signal': ', '.join(change['SignalList']),
+                    'recommendation': change['Decision'],
+                    'volume': 'N/A',
+                    'change_percent': 'N/A'
+                }, analysis_type="Watch")
+        finally:
+            if batched:
+                self.sheets_manager.close_batch()
+
+
+def print_changes(changes):
+    stamp = time.strftime('%H:%M:%S')
+    for change in changes:
+        previous = change['Previous'] or "—"
+        print(f"[{stamp}] {change['Symbol']:<6} | ${change['Price']:<8.2f} | "
+              f"{previous} → {change['Decision']} ({change['Signals']})")
+
+def watch_portfolio(portfolio_name, portfolio, sheets_manager=None, provider=None,
+                    interval=DEFAULT_WATCH_INTERVAL, cycles=None):
+    """
+    Surveille un portefeuille toutes les `interval` secondes jusqu'à Ctrl+C
+    (ou pendant `cycles` cycles). Retourne le nombre de changements détectés.
+    """
+    print(f"👁️  SURVEILLANCE - {portfolio_name} (toutes les {interval}s, Ctrl+C pour arrêter)")
+    print("=" * 80)
+    watcher = PortfolioWatcher(portfolio, provider, sheets_manager)
+    print(f"📥 Chargement de l'historique ({len(portfolio)} actions)...")
+    primed = watcher.prime()
+    print(f"✅ {primed} actions suivies, seuls les changements de décision seront affichés")
+
+    total = 0
+    sleeping = False
+    try:
+        while cycles is None or watcher.cycles < cycles:
+            changes = watcher.poll()
+            if not watcher.polled and not sleeping:
+                print("💤 Marchés fermés, en attente de l'ouverture...")
+            sleeping = not watcher.polled
+            total += len(changes)
+            print_changes(changes)
+            if cycles is not None and watcher.cycles >= cycles:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n⏹️  Surveillance arrêtée")
+    print(f"📊 {watcher.cycles} cycles, {total} changements")
+    return total
@@ -0,0 +1,220 @@
+"""
+Cache disque des données OHLCV journalières, par symbole.
+
+Chaque symbole est stocké dans un fichier Parquet (ou pickle si pyarrow
+n'est pas installé) accompagné d'un petit fichier JSON de métadonnées.
+Lors d'une nouvelle demande, seules les barres postérieures à la dernière
+date en cache sont téléchargées.
+"""
+
+import json
+import os
+import time as _time
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from metrics import metrics
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'TRADING_AGENT_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'ohlcv')
+)
+
+# Heures de séance par suffixe de symbole (fuseau, ouverture, clôture)
+MARKET_HOURS = {
+    '.PA': ('Europe/Paris', time(9, 0), time(17, 30)),
+    '.L': ('Europe/London', time(8, 0), time(16, 30)),
+    '.DE': ('Europe/Berlin', time(9, 0), time(17, 30)),
+    '.T': ('Asia/Tokyo', time(9, 0), time(15, 0)),
+}
+DEFAULT_MARKET_HOURS = ('America/New_York', time(9, 30), time(16, 0))
+
+# Durée de validité d'une lecture pendant que le marché est ouvert
+INTRADAY_TTL = timedelta(minutes=15)
+
+
+def get_market_hours(symbol):
+    for suffix, hours in MARKET_HOURS.items():
+        if symbol.upper().endswith(suffix):
+            return hours
+    return DEFAULT_MARKET_HOURS
+
+
+def _last_close(now_local, close_time):
+    """Dernière clôture (jour ouvré) antérieure ou égale à now_local."""
+    day = now_local.date()
+    while True:
+        if day.weekday() < 5:
+            close_dt = datetime.combine(day, close_time, tzinfo=now_local.tzinfo)
+            if close_dt <= now_local:
+                return close_dt
+        day -= timedelta(days=1)
+
+
+def is_market_open(symbol, now=None):
+    tz_name, open_time, close_time = get_market_hours(symbol)
+    now_local = (now or datetime.now(timezone.utc)).astimezone(ZoneInfo(tz_name))
+    return now_local.weekday() < 5 and open_time <= now_local.time() < close_time
+
+
+def is_stale(symbol, fetched_at, now=None):
+    """
+    Indique si une lecture faite à fetched_at (datetime UTC) doit être rafraîchie:
+    - une séance s'est clôturée depuis la lecture, ou
+    - le marché est ouvert et la lecture date de plus de INTRADAY_TTL.
+    """
+    now = now or datetime.now(timezone.utc)
+    tz_name, _, close_time = get_market_hours(symbol)
+    now_local = now.astimezone(ZoneInfo(tz_name))
+
+    if fetched_at < _last_close(now_local, close_time):
+        return True
+    if is_market_open(symbol, now) and now - fetched_at > INTRADAY_TTL:
+        return True
+    return False
+
+
+def normalize_index(data):
+    """
+    Index journalier sans fuseau (date de la séance à minuit). Ticker.history
+    renvoie un index dans le fuseau de la place, yf.download un index naïf:
+    les deux doivent pouvoir être comparés et fusionnés dans un même cache.
+    """
+    if data is None or not isinstance(data.index, pd.DatetimeIndex):
+        return data
+    index = data.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    index = index.normalize()
+    if data.index.tz is None and index.equals(data.index):
+        return data
+    return data.set_axis(index.rename(data.index.name), axis=0)
+
+
+class OHLCVCache:
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, fmt=CACHE_FORMAT):
+        self.cache_dir = cache_dir
+        self.format = fmt
+
+    def _paths(self, symbol):
+        base = os.path.join(self.cache_dir, symbol.replace('/', '_'))
+        extension = 'parquet' if self.format == 'parquet' else 'pkl'
+        return f"{base}.{extension}", f"{base}.json"
+
+    def _load_meta(self, symbol):
+        _, meta_path = self._paths(symbol)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _load(self, symbol):
+        data_path, _ = self._paths(symbol)
+        meta = self._load_meta(symbol)
+        if meta is None or not os.path.exists(data_path):
+            return None, None
+        try:
+            if self.format == 'parquet':
+                data = pd.read_parquet(data_path)
+            else:
+                data = pd.read_pickle(data_path)
+            # Caches écrits avant la normalisation: index dans le fuseau de la place
+            return normalize_index(data), meta
+        except Exception as e:
+            print(f"⚠️  Cache illisible pour {symbol}: {e}")
+            return None, None
+
+    def _save(self, symbol, data, meta):
+        data_path, meta_path = self._paths(symbol)
+        tmp_data, tmp_meta = f"{data_path}.tmp", f"{meta_path}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if self.format == 'parquet':
+                data.to_parquet(tmp_data)
+            else:
+                data.to_pickle(tmp_data)
+            with open(tmp_meta, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp_data, data_path)
+            os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            print(f"⚠️  Écriture cache impossible pour {symbol}: {e}")
+
+    def lookup(self, symbol, start_date):
+        """
+        Retourne (données en cache, date à partir de laquelle télécharger).
+        La date vaut None si le cache suffit à lui seul.
+        """
+        with metrics.span('cache.disk.read'):
+            data, meta = self._load(symbol)
+        if data is None or data.empty:
+            metrics.incr('cache.disk.misses')
+            return None, start_date.date()
+
+        covered_from = datetime.fromisoformat(meta['start']).date()
+        if covered_from > start_date.date():
+            # Fenêtre demandée plus longue que celle en cache: tout recharger
+            metrics.incr('cache.disk.misses')
+            return None, start_date.date()
+
+        fetched_at = datetime.fromtimestamp(meta['fetched_at'], tz=timezone.utc)
+        if not is_stale(symbol, fetched_at):
+            metrics.incr('cache.disk.hits')
+            return data, None
+
+        # Repartir de la dernière barre, potentiellement incomplète
+        metrics.incr('cache.disk.topups')
+        return data, data.index[-1].date()
+
+    def update(self, symbol, start_date, cached, fresh):
+        """
+        Fusionne les nouvelles barres avec le cache et l'enregistre. Sans
+        nouvelle barre (échec du téléchargement, symbole absent), l'ancien cache
+        est servi tel quel mais reste périmé: le prochain appel réessaie.
+        """
+        cached, fresh = normalize_index(cached), normalize_index(fresh)
+        if fresh is None or fresh.empty:
+            return None if cached is None or cached.empty else cached
+        if cached is None:
+            combined = fresh
+        else:
+            combined = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+            combined = combined[~combined.index.duplicated(keep='last')]
+
+        covered_from = start_date.date()
+        if cached is not None:
+            meta = self._load_meta(symbol)
+            if meta:
+                covered_from = min(covered_from, datetime.fromisoformat(meta['start']).date())
+
+        self._save(symbol, combined, {
+            'start': covered_from.isoformat(),
+            'fetched_at': _time.time()
+        })
+        return combined
+
+    def clear(self, symbol=None):
+        if symbol:
+            paths = self._paths(symbol)
+        elif os.path.isdir(self.cache_dir):
+            paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)]
+        else:
+            paths = []
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+ohlcv_cache = OHLCVCache()
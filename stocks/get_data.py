@@ -1,18 +1,222 @@
-import yfinance as yf
+import pandas as pd
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 
-def get_stock_data(symbol, days=60):
+from stocks.cache import ohlcv_cache
+from stocks.memory_cache import stock_data_memo
+from metrics import metrics
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_FETCH_TIMEOUT = 15
+TRADING_DAYS_PER_YEAR = 252
+
+def _window_start(end_date, days):
+    """Début d'une fenêtre calendaire contenant `days` séances (week-ends et jours fériés compris)."""
+    return end_date - timedelta(days=math.ceil(days * 365 / TRADING_DAYS_PER_YEAR) + 20)
+
+def get_stock_data(symbol, days=60, timeout=DEFAULT_FETCH_TIMEOUT):
+    memo = stock_data_memo.get(symbol, days)
+    if memo is not None:
+        return memo
+
     try:
         end_date = datetime.now()
-        start_date = end_date - timedelta(days=days + 20)
-        
-        stock = yf.Ticker(symbol)
-        data = stock.history(start=start_date, end=end_date)
-        
-        if data.empty:
+        start_date = _window_start(end_date, days)
+
+        cached, fetch_from = ohlcv_cache.lookup(symbol, start_date)
+        if fetch_from is None:
+            data = cached
+        else:
+            import yfinance as yf  # Chargé à la première requête réseau
+            stock = yf.Ticker(symbol)
+            metrics.incr('yfinance.requests')
+            with metrics.span('fetch.yfinance'):
+                fresh = stock.history(start=fetch_from, end=end_date, timeout=timeout)
+            data = ohlcv_cache.update(symbol, start_date, cached, fresh)
+
+        if data is None or data.empty:
             return None
-            
-        return data.tail(days)
+
+        data = data.tail(days)
+        stock_data_memo.put(symbol, days, data)
+        return data
     except Exception as e:
+        metrics.incr('yfinance.errors')
         print(f"❌ Erreur pour {symbol}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def get_bulk_stock_data(*portfolios, days=60, timeout=DEFAULT_FETCH_TIMEOUT):
+    """
+    Récupère en une seule requête multi-tickers tous les symboles d'un ou
+    plusieurs portefeuilles (PERSO, BIGPHARMA, SMALLPHARMA...).
+
+    Retourne un dict:
+        'data':    {symbole: DataFrame} pour les symboles récupérés
+        'missing': symboles absents de la réponse
+        'empty':   symboles présents mais sans aucune donnée
+        'error':   message d'erreur si la requête entière a échoué, sinon None
+    """
+    symbols = list(dict.fromkeys(symbol for portfolio in portfolios for symbol in portfolio))
+    report = {'data': {}, 'missing': [], 'empty': [], 'error': None}
+    if not symbols:
+        return report
+
+    end_date = datetime.now()
+    start_date = _window_start(end_date, days)
+
+    # Servir depuis le cache disque ce qui est à jour, ne télécharger que le reste
+    pending = {}
+    for symbol in symbols:
+        memo = stock_data_memo.get(symbol, days)
+        if memo is not None:
+            report['data'][symbol] = memo
+            continue
+        cached, fetch_from = ohlcv_cache.lookup(symbol, start_date)
+        if fetch_from is None:
+            report['data'][symbol] = cached.tail(days)
+            stock_data_memo.put(symbol, days, report['data'][symbol])
+        else:
+            pending[symbol] = (cached, fetch_from)
+    if not pending:
+        return report
+    to_download = list(pending)
+    download_from = min(fetch_from for _, fetch_from in pending.values())
+
+    try:
+        import yfinance as yf  # Chargé à la première requête réseau
+        metrics.incr('yfinance.requests')
+        with metrics.span('fetch.yfinance_bulk'):
+            raw = yf.download(
+                to_download, start=download_from, end=end_date,
+                group_by='ticker', auto_adjust=True, actions=True,
+                threads=True, progress=False, timeout=timeout
+            )
+    except Exception as e:
+        metrics.incr('yfinance.errors')
+        print(f"❌ Erreur téléchargement groupé: {e}")
+        report['error'] = str(e)
+        report['missing'] = to_download
+        return report
+
+    if raw is None or raw.empty:
+        available = set()
+    else:
+        if raw.columns.nlevels == 1:
+            # Anciennes versions de yfinance: colonnes à plat pour un seul ticker
+            raw = pd.concat({to_download[0]: raw}, axis=1)
+        available = set(raw.columns.get_level_values(0))
+
+    for symbol in to_download:
+        cached, fetch_from = pending[symbol]
+        fresh = raw[symbol].dropna(how='all') if symbol in available else None
+        if fresh is not None and not fresh.empty:
+            fresh = fresh[fresh.index.date >= fetch_from]
+        data = ohlcv_cache.update(symbol, start_date, cached, fresh)
+        if data is None:
+            if symbol in available:
+                report['empty'].append(symbol)
+            else:
+                report['missing'].append(symbol)
+            continue
+        report['data'][symbol] = data.tail(days)
+        stock_data_memo.put(symbol, days, report['data'][symbol])
+
+    return report
+
+def get_latest_prices(symbols, interval='1m', timeout=DEFAULT_FETCH_TIMEOUT):
+    """
+    Dernier prix intrajournalier de plusieurs symboles, en une requête groupée
+    et sans passer par les caches. Retourne {symbole: (horodatage, prix)};
+    les symboles sans cotation du jour sont absents.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    try:
+        import yfinance as yf  # Chargé à la première requête réseau
+        metrics.incr('yfinance.requests')
+        with metrics.span('fetch.intraday'):
+            raw = yf.download(
+                symbols, period='1d', interval=interval,
+                group_by='ticker', auto_adjust=True,
+                threads=True, progress=False, timeout=timeout
+            )
+    except Exception as e:
+        metrics.incr('yfinance.errors')
+        print(f"❌ Erreur cotations intrajournalières: {e}")
+        return {}
+
+    if raw is None or raw.empty:
+        return {}
+    if raw.columns.nlevels == 1:
+        raw = pd.concat({symbols[0]: raw}, axis=1)
+    available = set(raw.columns.get_level_values(0))
+
+    quotes = {}
+    for symbol in symbols:
+        if symbol not in available:
+            continue
+        closes = raw[symbol]['Close'].dropna()
+        if not closes.empty:
+            quotes[symbol] = (closes.index[-1], float(closes.iloc[-1]))
+    return quotes
+
+def get_cache_stats():
+    """Compteurs du cache mémoire (succès, échecs, taille)."""
+    return stock_data_memo.stats()
+
+def fetch_portfolio_data(portfolio, days=60, max_workers=DEFAULT_MAX_WORKERS,
+                         timeout=DEFAULT_FETCH_TIMEOUT, batched=True):
+    """
+    Récupère les données de tous les symboles d'un portefeuille en parallèle.
+    Retourne une liste de (symbole, données) dans l'ordre du portefeuille,
+    avec None pour les symboles en échec ou hors délai.
+
+    Avec batched=True, une seule requête groupée est tentée d'abord; les
+    appels individuels ne servent que si cette requête échoue entièrement.
+    """
+    symbols = list(portfolio)
+    if not symbols:
+        return []
+
+    if batched:
+        report = get_bulk_stock_data(portfolio, days=days, timeout=timeout)
+        if report['error'] is None:
+            unavailable = report['missing'] + report['empty']
+            if unavailable:
+                print(f"⚠️  Aucune donnée pour: {', '.join(unavailable)}")
+            return [(symbol, report['data'].get(symbol)) for symbol in symbols]
+        print("🔄 Repli sur les téléchargements individuels...")
+
+    return fetch_concurrently(get_stock_data, symbols, days, max_workers, timeout)
+
+def fetch_concurrently(loader, symbols, days=60, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_FETCH_TIMEOUT):
+    """
+    Appelle loader(symbole, days, timeout) pour chaque symbole dans un pool
+    de threads borné. Retourne [(symbole, données)] dans l'ordre des symboles.
+
+    Toutes les requêtes partagent une même échéance: un délai par vague de
+    max_workers symboles, et non un délai par symbole attendu l'un après l'autre.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return []
+
+    workers = max(1, min(max_workers, len(symbols)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+    try:
+        futures = [executor.submit(loader, symbol, days, timeout) for symbol in symbols]
+        wait(futures, timeout=timeout * math.ceil(len(symbols) / workers))
+        results = []
+        for symbol, future in zip(symbols, futures):
+            if future.done():
+                data = future.result()
+            else:
+                print(f"⏱️  Délai dépassé pour {symbol} ({timeout}s)")
+                data = None
+            results.append((symbol, data))
+        return results
+    finally:
+        # Ne pas bloquer sur un téléchargement resté suspendu
+        executor.shutdown(wait=False, cancel_futures=True)
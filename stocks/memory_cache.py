@@ -0,0 +1,81 @@
+"""
+Cache mémoire LRU des données de marché, partagé par toutes les actions du menu.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import metrics
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_TTL = 15 * 60
+
+
+class StockDataMemo:
+    """
+    Cache LRU borné en taille et en durée, indexé par (symbole, fenêtre).
+    Une demande de fenêtre plus courte est servie en découpant une fenêtre
+    plus longue déjà en mémoire.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol, days):
+        now = time.monotonic()
+        with self._lock:
+            best_key = None
+            for key in list(self._entries):
+                stored_at, _ = self._entries[key]
+                if now - stored_at > self.ttl:
+                    del self._entries[key]
+                    continue
+                if key[0] == symbol and key[1] >= days and (best_key is None or key[1] < best_key[1]):
+                    best_key = key
+
+            if best_key is None:
+                self.misses += 1
+                metrics.incr('cache.memory.misses')
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            metrics.incr('cache.memory.hits')
+            _, data = self._entries[best_key]
+        return data.tail(days).copy()
+
+    def put(self, symbol, days, data):
+        if data is None:
+            return
+        with self._lock:
+            key = (symbol, days)
+            self._entries[key] = (time.monotonic(), data.copy())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+stock_data_memo = StockDataMemo()
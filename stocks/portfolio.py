@@ -41,3 +41,9 @@ SMALLPHARMA = {
     'HEM': 'Hemogenyx Pharmaceuticals',
     'DRUG' : 'Bright Minds Biosciences',
 }
+
+PORTFOLIOS = {
+    'PERSO': PERSO,
+    'BIGPHARMA': BIGPHARMA,
+    'SMALLPHARMA': SMALLPHARMA,
+}
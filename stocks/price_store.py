@@ -0,0 +1,135 @@
+"""
+Stockage compact en colonnes pour les grands univers de symboles.
+
+Un seul axe de dates partagé, les prix Open/High/Low/Close en float32 et le
+volume en entier, dans des tableaux contigus (une ligne par symbole). Les
+DataFrames et matrices de prix remis aux analyses sont des vues sur ces
+tableaux, sans copie. Dividends et Stock Splits ne sont pas conservés: les
+prix de Yahoo Finance sont déjà ajustés.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stocks.get_data import DEFAULT_MAX_WORKERS, DEFAULT_FETCH_TIMEOUT
+from stocks.providers import DataProvider
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close')
+PRICE_DTYPE = np.float32
+VOLUME_DTYPE = np.int64
+
+
+class PriceStore(DataProvider):
+    """
+    Matrices (symboles x dates) alignées sur un axe de dates commun.
+    Utilisable comme fournisseur de données par les analyses.
+    """
+
+    name = 'store'
+
+    def __init__(self, symbols, dates, prices, volume):
+        self.symbols = list(symbols)
+        self.dates = pd.DatetimeIndex(dates)
+        self.prices = prices
+        self.volume = volume
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Construit le stockage à partir de {symbole: DataFrame OHLCV}."""
+        frames = {symbol: data for symbol, data in frames.items() if data is not None and not data.empty}
+        dates = pd.DatetimeIndex([])
+        for data in frames.values():
+            dates = dates.union(_naive_index(data.index))
+
+        shape = (len(frames), len(dates))
+        prices = {field: np.full(shape, np.nan, dtype=PRICE_DTYPE) for field in PRICE_FIELDS}
+        volume = np.zeros(shape, dtype=VOLUME_DTYPE)
+        for row, data in enumerate(frames.values()):
+            positions = dates.get_indexer(_naive_index(data.index))
+            for field in PRICE_FIELDS:
+                if field in data:
+                    prices[field][row, positions] = data[field].to_numpy(dtype=PRICE_DTYPE)
+            if 'Volume' in data:
+                volume[row, positions] = data['Volume'].fillna(0).to_numpy(dtype=VOLUME_DTYPE)
+        return cls(frames, dates, prices, volume)
+
+    @classmethod
+    def from_provider(cls, symbols, provider, days=252, max_workers=DEFAULT_MAX_WORKERS):
+        """Charge les symboles depuis un fournisseur (Yahoo Finance, fichiers locaux...)."""
+        frames = provider.fetch_portfolio_data(list(dict.fromkeys(symbols)), days=days, max_workers=max_workers)
+        return cls.from_frames(dict(frames))
+
+    def __contains__(self, symbol):
+        return symbol in self._rows
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.prices.values()) + self.volume.nbytes + self.dates.nbytes
+
+    def _span(self, symbol):
+        """Tranche [première, dernière] date cotée du symbole sur l'axe commun."""
+        listed = np.flatnonzero(~np.isnan(self.prices['Close'][self._rows[symbol]]))
+        if len(listed) == 0:
+            return None
+        return slice(listed[0], listed[-1] + 1)
+
+    def column(self, symbol, field='Close'):
+        """Vue (sans copie) sur une colonne d'un symbole, le long de l'axe commun."""
+        if field == 'Volume':
+            return self.volume[self._rows[symbol]]
+        return self.prices[field][self._rows[symbol]]
+
+    def frame(self, symbol, days=None):
+        """
+        DataFrame OHLCV d'un symbole. Les colonnes sont des vues sur le stockage;
+        une copie n'est faite que si le symbole a des trous sur l'axe commun
+        (calendrier de cotation différent des autres symboles).
+        """
+        span = self._span(symbol)
+        if span is None:
+            return None
+        row = self._rows[symbol]
+        index = self.dates[span]
+        columns = {field: self.prices[field][row, span] for field in PRICE_FIELDS}
+        columns['Volume'] = self.volume[row, span]
+
+        listed = ~np.isnan(columns['Close'])
+        if not listed.all():
+            index = index[listed]
+            columns = {field: values[listed] for field, values in columns.items()}
+
+        data = pd.DataFrame(
+            {field: pd.Series(values, index=index, copy=False) for field, values in columns.items()},
+            copy=False
+        )
+        return data.iloc[-days:] if days else data
+
+    def close_panel(self, symbols=None):
+        """Matrice de clôtures (dates x symboles), vue sans copie si tous les symboles sont demandés."""
+        close = self.prices['Close']
+        if symbols is None:
+            return pd.DataFrame(close.T, index=self.dates, columns=self.symbols, copy=False)
+        symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol in self._rows]
+        rows = [self._rows[symbol] for symbol in symbols]
+        return pd.DataFrame(close[rows].T, index=self.dates, columns=symbols, copy=False)
+
+    def get_stock_data(self, symbol, days=60, timeout=DEFAULT_FETCH_TIMEOUT):
+        if symbol not in self._rows:
+            print(f"❌ {symbol} absent du stockage")
+            return None
+        return self.frame(symbol, days)
+
+    def fetch_portfolio_data(self, portfolio, days=60, max_workers=DEFAULT_MAX_WORKERS,
+                             timeout=DEFAULT_FETCH_TIMEOUT):
+        # Données déjà en mémoire: pas de pool de threads
+        return [(symbol, self.get_stock_data(symbol, days, timeout)) for symbol in portfolio]
+
+
+def _naive_index(index):
+    """Dates sans fuseau horaire, pour aligner des places de cotation différentes."""
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize(None) if index.tz is not None else index
@@ -0,0 +1,125 @@
+"""
+Fournisseurs de données de marché.
+
+Les analyses reçoivent un fournisseur en paramètre: Yahoo Finance par
+défaut, ou un répertoire local de fichiers par symbole (instantané
+nocturne) pour les scans et backtests sans réseau.
+"""
+
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from stocks.get_data import (
+    get_stock_data, fetch_portfolio_data, fetch_concurrently, get_latest_prices,
+    DEFAULT_MAX_WORKERS, DEFAULT_FETCH_TIMEOUT
+)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+DATA_DIR_ENV = 'TRADING_AGENT_DATA_DIR'
+
+
+class DataProvider(ABC):
+    """
+    Interface commune des fournisseurs de données. Seul get_stock_data est
+    obligatoire: un fournisseur incomplet échoue dès sa construction.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def get_stock_data(self, symbol, days=60, timeout=DEFAULT_FETCH_TIMEOUT):
+        """Retourne le DataFrame OHLCV des `days` dernières barres, ou None."""
+
+    def fetch_portfolio_data(self, portfolio, days=60, max_workers=DEFAULT_MAX_WORKERS,
+                             timeout=DEFAULT_FETCH_TIMEOUT):
+        """Retourne [(symbole, données)] dans l'ordre du portefeuille."""
+        return fetch_concurrently(self.get_stock_data, portfolio, days, max_workers, timeout)
+
+    def get_latest_prices(self, symbols, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_FETCH_TIMEOUT):
+        """Retourne {symbole: (horodatage, prix)} à partir de la dernière barre disponible."""
+        quotes = {}
+        for symbol, data in self.fetch_portfolio_data(symbols, days=1, max_workers=max_workers, timeout=timeout):
+            if data is not None and not data.empty:
+                quotes[symbol] = (data.index[-1], float(data['Close'].iloc[-1]))
+        return quotes
+
+
+class YFinanceProvider(DataProvider):
+    """Yahoo Finance, à travers les caches mémoire et disque de stocks.get_data."""
+
+    name = 'yfinance'
+
+    def get_stock_data(self, symbol, days=60, timeout=DEFAULT_FETCH_TIMEOUT):
+        return get_stock_data(symbol, days, timeout)
+
+    def fetch_portfolio_data(self, portfolio, days=60, max_workers=DEFAULT_MAX_WORKERS,
+                             timeout=DEFAULT_FETCH_TIMEOUT):
+        return fetch_portfolio_data(portfolio, days, max_workers, timeout)
+
+    def get_latest_prices(self, symbols, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_FETCH_TIMEOUT):
+        return get_latest_prices(symbols, timeout=timeout)
+
+
+class LocalFileProvider(DataProvider):
+    """
+    Lit un répertoire de fichiers par symbole (SYMBOLE.parquet ou SYMBOLE.csv)
+    en mémoire mappée, sans aucun appel réseau. Les CSV doivent avoir la date
+    en première colonne et les colonnes Open/High/Low/Close/Volume.
+    """
+
+    name = 'local'
+    EXTENSIONS = ('.parquet', '.csv')
+
+    def __init__(self, directory):
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Répertoire de données introuvable: {directory}")
+        self.directory = directory
+
+    def _find_file(self, symbol):
+        base = os.path.join(self.directory, symbol.replace('/', '_'))
+        for extension in self.EXTENSIONS:
+            if os.path.exists(base + extension):
+                return base + extension
+        return None
+
+    def _read(self, path):
+        if path.endswith('.parquet'):
+            if pq is not None:
+                return pq.read_table(path, memory_map=True).to_pandas()
+            return pd.read_parquet(path)
+        return pd.read_csv(path, index_col=0, parse_dates=True, memory_map=True)
+
+    def get_stock_data(self, symbol, days=60, timeout=None):
+        path = self._find_file(symbol)
+        if path is None:
+            print(f"❌ Pas de fichier local pour {symbol}")
+            return None
+        try:
+            data = self._read(path).sort_index()
+        except Exception as e:
+            print(f"❌ Erreur lecture {path}: {e}")
+            return None
+        if data.empty:
+            return None
+        return data.tail(days)
+
+    def available_symbols(self):
+        return sorted(
+            os.path.splitext(name)[0] for name in os.listdir(self.directory)
+            if name.endswith(self.EXTENSIONS)
+        )
+
+
+def get_default_provider():
+    """Fournisseur local si TRADING_AGENT_DATA_DIR est défini, sinon Yahoo Finance."""
+    data_dir = os.environ.get(DATA_DIR_ENV)
+    if data_dir:
+        print(f"📁 Données locales: {data_dir}")
+        return LocalFileProvider(data_dir)
+    return YFinanceProvider()